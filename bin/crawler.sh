@@ -3,29 +3,12 @@
 
 echo "Initiating the crawling process ..."
 
-# Generate seed words and seed URLS
-# Loop to run the seeder.py script 10 times
-for i in {1..10}; do
-   echo "Generating seed words and seed URLS for the $i time ..."
-   python3 ./pipeline/seeder.py
-done
-
-# # Crawling the World Wide Web with 15 rounds
-echo "Crawling the World Wide Web ..."
-cd nutch
-./bin/crawl -i -s urls/ --hostdbupdate --hostdbgenerate crawl/ 15
-cd ..
-# # Crawling concluded
-echo "The crawling have been successfully concluded."
-
-# Construct text corpus
-echo "Constructing text corpus ..."
-python3 ./pipeline/construct_corpus.py
-# Corpus concluded
-echo "The corpus have been successfully generated."
-
-# Generate collection statistic
-echo "Generating statistic for the collection ..."
-python3 ./pipeline/view_collection_stat.py
-# Statistic generation concluded
-echo "The statistics have been successfully generated."
+# Run the pipeline stages in a single process, so the LID model and the domain resolver are loaded once:
+# (1) Generate seed words and seed URLS, running the seeder 10 times.
+# (2) Crawl the World Wide Web with 15 rounds.
+# (3) Construct the text corpus.
+# (4) Generate the collection statistic.
+# (5) Feed the Tetun yield of each domain back to the Nutch seeds and the next seeding cycle.
+python3 ./pipeline/cli.py all --rounds 10 --crawl-rounds 15 --nutch-home nutch --import-report
+
+echo "The crawling, corpus and statistics have been successfully generated."
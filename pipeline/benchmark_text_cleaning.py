@@ -0,0 +1,106 @@
+""" Benchmark of the document-level text cleaner against the former per-line cleaning. """
+
+import argparse
+import json
+import random
+import timeit
+import unicodedata
+from typing import List
+from common_utils.text_cleaner import TextCleaner
+from common_utils.utils import remove_html_tags
+
+SAMPLE_LINES = [
+    "Prezidente Repúblika <b>hato'o</b> mensajen ba povu tomak iha loron ne'e.",
+    "Governu sei hala&#39;o programa foun ba <a href=\"/edukasaun\">edukasaun</a> iha munisípiu hotu.",
+    "   ",
+    "",
+    "Ministériu Saúde &amp; parseiru sira halo kampaña vasinasaun\tiha  Dili.",
+    "<p>Komunidade sira hein katak projetu ne'e bele ajuda sira.</p>",
+    "2023",
+]
+
+
+def generate_documents(total_documents: int, lines_per_document: int) -> List[str]:
+    """ Generates synthetic page contents with tags, entities, spaces and empty lines. """
+
+    random.seed(0)
+    return ["\n".join(random.choices(SAMPLE_LINES, k=lines_per_document)) for _ in range(total_documents)]
+
+
+def load_documents(dump_file_path: str) -> List[str]:
+    """ Loads the page contents from a JSON Lines dump. """
+
+    with open(dump_file_path, "r", encoding="utf-8") as dump_file:
+        documents = [json.loads(line).get("content") for line in dump_file if line.strip()]
+
+    return [document for document in documents if document]
+
+
+def clean_per_line(content: str, max_consecutive_newlines: int) -> List[str]:
+    """ The former cleaning: each line is stripped and cleaned, and the empty lines are counted. """
+
+    lines = []
+    consecutive_newlines = 0
+    for line in content.split("\n"):
+        text_line = remove_html_tags(line.strip())
+        if len(text_line) == 0:
+            consecutive_newlines += 1
+        else:
+            consecutive_newlines = 0
+        if len(text_line) == 0 and consecutive_newlines == max_consecutive_newlines:
+            continue
+        lines.append(text_line)
+
+    return lines
+
+
+def clean_per_line_normalized(content: str, max_consecutive_newlines: int) -> List[str]:
+    """ The per-line cleaning with the same Unicode normalization as the text cleaner. """
+
+    lines = []
+    consecutive_newlines = 0
+    for line in content.split("\n"):
+        text_line = unicodedata.normalize("NFC", remove_html_tags(line)).strip()
+        if len(text_line) == 0:
+            consecutive_newlines += 1
+        else:
+            consecutive_newlines = 0
+        if len(text_line) == 0 and consecutive_newlines >= max_consecutive_newlines:
+            continue
+        lines.append(text_line)
+
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dump", help="JSON Lines dump with a 'content' field, synthetic pages are used otherwise.")
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--lines", type=int, default=50)
+    parser.add_argument("--max-consecutive-newline", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    documents = load_documents(args.dump) if args.dump else generate_documents(args.documents, args.lines)
+    text_cleaner = TextCleaner(args.max_consecutive_newline)
+
+    per_line = min(timeit.repeat(
+        lambda: [clean_per_line(doc, args.max_consecutive_newline) for doc in documents],
+        number=1, repeat=args.repeat))
+    per_line_normalized = min(timeit.repeat(
+        lambda: [clean_per_line_normalized(doc, args.max_consecutive_newline) for doc in documents],
+        number=1, repeat=args.repeat))
+    per_document = min(timeit.repeat(
+        lambda: [text_cleaner.clean_document(doc) for doc in documents],
+        number=1, repeat=args.repeat))
+
+    total_lines = sum(doc.count("\n") + 1 for doc in documents)
+    print(f"Documents: {len(documents)}, lines: {total_lines}")
+    print(f"Per-line cleaning (former):          {per_line:.3f}s")
+    print(f"Per-line cleaning (same normalizing): {per_line_normalized:.3f}s")
+    print(f"Per-document cleaning:                {per_document:.3f}s "
+          f"({per_line / per_document:.2f}x former, {per_line_normalized / per_document:.2f}x same normalizing)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import os
+import sys
+import time
+import argparse
+import importlib
+import subprocess
+import warnings
+from typing import List, Tuple
+
+warnings.filterwarnings("ignore", category=UserWarning)
+
+"""
+Single entry point of the pipeline. The stages run in the same process, so the LID model and the
+domain resolver are loaded once, and the heavy modules are only imported by the stages using them.
+
+Usage: python3 ./pipeline/cli.py {seed,construct,stats,sample,feedback,all} [--import-report] [key=value ...]
+"""
+
+PIPELINE_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_FILE = os.path.join(PIPELINE_DIR, "conf", "config.yaml")
+
+# Import time of each stage module, in the order the modules were imported.
+IMPORT_TIMES: List[Tuple[str, float]] = []
+
+
+def timed_import(module_name: str) -> object:
+    """ Imports a module and records the time spent, including the modules it imports for the first time. """
+
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    IMPORT_TIMES.append((module_name, time.perf_counter() - start))
+
+    return module
+
+
+def load_config(overrides: List[str]) -> object:
+    """
+    Loads the pipeline configuration with OmegaConf, without starting Hydra.
+
+    :param overrides: a list of "key=value" overrides, e.g. "params.lid_batch_size=1024".
+    :return: the pipeline configuration.
+    """
+
+    from omegaconf import OmegaConf
+
+    # The configuration refers to ${hydra:runtime.cwd}, resolved here to the current directory as Hydra does.
+    if not OmegaConf.has_resolver("hydra"):
+        OmegaConf.register_new_resolver(
+            "hydra", lambda key: os.getcwd() if key == "runtime.cwd" else None)
+    cfg = OmegaConf.load(CONFIG_FILE)
+    if overrides:
+        cfg = OmegaConf.merge(cfg, OmegaConf.from_dotlist(overrides))
+
+    return cfg
+
+
+def run_seed(cfg, args) -> None:
+    seeder = timed_import("seeder")
+    for i in range(1, args.rounds + 1):
+        print(f"Generating seed words and seed URLS for the {i} time ...")
+        # A failing round does not stop the next ones, as the former loop of seeder runs.
+        try:
+            seeder.MainSeeder(cfg).run()
+        except Exception as e:
+            print(f"\nError while running the seeder for the {i} time: {e}\n")
+
+
+def run_crawl(cfg, args) -> None:
+    if args.crawl_rounds <= 0:
+        return
+    print(f"Crawling the World Wide Web with {args.crawl_rounds} rounds ...")
+    # db.injector.update applies the seed score and fetch interval of the crawl feedback to the urls already in the crawldb.
+    subprocess.run(
+        ["./bin/crawl", "-i", "-D", "db.injector.update=true", "-s", "urls/", "--hostdbupdate", "--hostdbgenerate",
+         "crawl/", str(args.crawl_rounds)],
+        cwd=args.nutch_home,
+        check=True
+    )
+
+
+def run_construct(cfg, args) -> None:
+    construct_corpus = timed_import("construct_corpus")
+    construct_corpus.ConstructCorpus(cfg).run()
+
+
+def run_stats(cfg, args) -> None:
+    view_collection_stat = timed_import("view_collection_stat")
+    view_collection_stat.ViewCollectionStatistic(cfg).run()
+
+
+def run_sample(cfg, args) -> None:
+    generate_eval_sample = timed_import("generate_eval_sample")
+    generate_eval_sample.GenerateEvalSample(cfg).run()
+
+
+def run_feedback(cfg, args) -> None:
+    generate_crawl_feedback = timed_import("generate_crawl_feedback")
+    generate_crawl_feedback.GenerateCrawlFeedback(cfg).run()
+
+
+def run_all(cfg, args) -> None:
+    # A failing stage does not stop the next ones, as the former crawler script.
+    for stage in (run_seed, run_crawl, run_construct, run_stats, run_feedback):
+        try:
+            stage(cfg, args)
+        except Exception as e:
+            print(f"\nError while running the stage {stage.__name__}: {e}\n")
+
+
+STAGES = {
+    "seed": run_seed,
+    "construct": run_construct,
+    "stats": run_stats,
+    "sample": run_sample,
+    "feedback": run_feedback,
+    "all": run_all,
+}
+
+
+def print_import_report(start_time: float) -> None:
+    """ Prints the import time of each stage module and the total time of the run. """
+
+    print("\n========= Import time report =========")
+    for module_name, seconds in IMPORT_TIMES:
+        print(f"Module: {module_name}, import time: {seconds * 1000:.1f} ms")
+    print(f"Total import time: {sum(s for _, s in IMPORT_TIMES) * 1000:.1f} ms")
+    print(f"Total run time: {time.perf_counter() - start_time:.2f} s")
+    print("Run with `python3 -X importtime` for the import time of each module.")
+
+
+def main() -> None:
+    start_time = time.perf_counter()
+    parser = argparse.ArgumentParser(description="Tetun crawler pipeline.")
+    parser.add_argument("stage", choices=STAGES, help="the pipeline stage to run.")
+    parser.add_argument("overrides", nargs="*", help="configuration overrides as key=value.")
+    parser.add_argument("--rounds", type=int, default=1, help="number of seeder runs (seed and all).")
+    parser.add_argument("--crawl-rounds", type=int, default=0,
+                        help="number of Nutch crawling rounds run between seed and construct (all), 0 to skip.")
+    parser.add_argument("--nutch-home", default="nutch", help="Nutch folder, relative to the current directory.")
+    parser.add_argument("--import-report", action="store_true", help="print the import time of the stages.")
+    args = parser.parse_args()
+
+    # The stage modules import their dependencies relative to the pipeline folder.
+    if PIPELINE_DIR not in sys.path:
+        sys.path.insert(0, PIPELINE_DIR)
+
+    cfg = load_config(args.overrides)
+    STAGES[args.stage](cfg, args)
+    if args.import_report:
+        print_import_report(start_time)
+
+
+if __name__ == "__main__":
+    main()
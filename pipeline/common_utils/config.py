@@ -8,6 +8,7 @@ from typing import List
 class Paths:
     data: str
     nutch: str
+    nutch_conf: str
     lid: str
     eval_sample: str
 
@@ -19,25 +20,60 @@ class Files:
     nutch_seed_url: str
     domain: str
     lid_model: str
+    lid_mmap_model: str
     final_corpus: str
     stats_in_out_links: str
     url_in_out_links: str
+    document_dump: str
+    corpus_stats: str
+    ranked_domain: str
+    pruned_domain: str
+    nutch_url_filter: str
 
 
 @dataclass
 class Params:
+    document_source: str
     solr_api_url: str
     solr_start: int
     solr_rows: int
+    solr_push_down_filters: bool
+    solr_url_field: str
+    solr_content_field: str
+    solr_host_field: str
+    url_exclude_substrings: List[str]
     language: str
     lang_proba_threshold: float
+    lid_cascade: bool
+    lid_cascade_accept: bool
+    lid_cascade_min_tokens: int
+    lid_cascade_accept_ratio: float
+    lid_cascade_reject_ratio: float
+    lid_cascade_min_foreign_hits: int
+    lid_cascade_audit_ratio: float
+    lid_batch_size: int
+    lid_use_mmap_model: bool
+    lid_export_verify_lines: int
     corpus_sample_ratio: float
     num_seed_word_sample: int
+    num_seed_queries: int
     google_search_num_result: int
+    search_backend: str
+    search_backend_location: str
+    search_max_workers: int
+    search_min_interval: float
+    search_max_retries: int
+    search_backoff_factor: float
     max_seed_url_length: int
     max_consecutive_newline: int
     total_samples: int
     total_text_pages: int
+    collect_link_stats: bool
+    feedback_min_fetched_docs: int
+    feedback_min_yield: float
+    feedback_unknown_score: float
+    feedback_min_fetch_interval: int
+    feedback_max_fetch_interval: int
     extensions_to_exclude: List[str]
     domains_to_exclude: List[str]
 
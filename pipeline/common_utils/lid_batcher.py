@@ -0,0 +1,40 @@
+from typing import List
+from common_utils.tetun_lid import TetunLid
+
+
+class LidBatcher:
+    """
+    LID batcher class applies the Tetun LID to groups of texts (e.g. the titles or the lines
+    of many documents) with one model call per batch of at least the target size, instead of
+    one call per group. A group is never split between two batches.
+    """
+
+    def __init__(self, tetun_lid: TetunLid, batch_size: int) -> None:
+        self.tetun_lid = tetun_lid
+        self.batch_size = max(batch_size, 1)
+
+    def get_tetun_groups(self, groups: List[List[str]]) -> List[List[str]]:
+        """
+        Gets the Tetun texts of each group, keeping the order of the groups and of their texts.
+
+        :param groups: a list of lists of strings.
+        :return: a list containing the Tetun texts of each group.
+        """
+
+        is_tetun = []
+        batch = []
+        for group in groups:
+            batch.extend(group)
+            if len(batch) >= self.batch_size:
+                is_tetun.extend(self.tetun_lid.predict_tetun_cascade(batch))
+                batch = []
+        is_tetun.extend(self.tetun_lid.predict_tetun_cascade(batch))
+
+        tetun_groups = []
+        offset = 0
+        for group in groups:
+            tetun_groups.append(
+                [text for text, keep in zip(group, is_tetun[offset:offset + len(group)]) if keep])
+            offset += len(group)
+
+        return tetun_groups
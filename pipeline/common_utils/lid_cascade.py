@@ -0,0 +1,137 @@
+import re
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+""" This module contains the cheap pre-classifier applied before the Tetun LID model. """
+
+# Frequent function words, the words shared by the languages or also used in Tetun (e.g. "no", "la", "de",
+# "uma", "be") are left out.
+TETUN_STOPWORDS = frozenset([
+    "iha", "ba", "nia", "ne'e", "ne'ebé", "sira", "ho", "hodi", "maka", "mak", "atu",
+    "husi", "hosi", "tanba", "ka", "sei", "ona", "hanesan", "bele", "hotu", "ita",
+    "ami", "hau", "ninia", "maibé", "hafoin", "tuir", "kona-ba", "mós", "liu", "iha-ne'e",
+    "nune'e", "entaun", "sai", "halo", "hala'o", "laiha", "deit", "ida", "rua", "hirak",
+])
+FOREIGN_STOPWORDS = frozenset([
+    # English
+    "the", "and", "of", "to", "is", "in", "that", "for", "with", "was", "are", "this",
+    "it", "on", "by", "as", "from", "have", "has", "which", "were", "will", "or",
+    # Indonesian
+    "yang", "dan", "di", "ini", "itu", "dengan", "untuk", "dari", "tidak", "dalam",
+    "akan", "pada", "juga", "ke", "karena", "adalah", "bahwa", "oleh", "kami", "mereka",
+    # Portuguese
+    "que", "não", "são", "pelo", "pela", "também", "muito", "isso", "foi",
+])
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+(?:['’-][^\W\d_]+)*")
+LETTER_PATTERN = re.compile(r"[^\W\d_]")
+URL_PATTERN = re.compile(r"^(?:(?:https?://|www\.)\S+|[\w.+-]+@[\w-]+\.[\w.-]+)$", re.IGNORECASE)
+
+
+class LidPreClassifier:
+    """
+    The LID pre-classifier accepts or rejects the obvious lines with cheap rules:
+    (1) Empty lines, lines without letters and URLs (or emails) are rejected.
+    (2) Lines with several English, Indonesian or Portuguese stopwords, a high ratio of them and no Tetun
+        stopword are rejected.
+    (3) Optionally, lines with a high ratio of Tetun stopwords and no foreign stopword are accepted.
+
+    The remaining lines are left to the LID model. A sample of the decided lines is also
+    audited with the LID model to report the agreement of each rule.
+    """
+
+    def __init__(
+        self,
+        min_tokens: int,
+        accept_ratio: float,
+        reject_ratio: float,
+        min_foreign_hits: int,
+        accept_tetun: bool = False,
+        audit_ratio: float = 0.0,
+    ) -> None:
+        self.min_tokens = min_tokens
+        self.accept_ratio = accept_ratio
+        self.reject_ratio = reject_ratio
+        self.min_foreign_hits = min_foreign_hits
+        self.accept_tetun = accept_tetun
+        self.audit_stride = round(1 / audit_ratio) if audit_ratio > 0 else 0
+        self.total_lines = 0
+        self.decided_lines = 0
+        self.rule_counts = defaultdict(int)
+        self.audit_counts = defaultdict(int)
+        self.agreement_counts = defaultdict(int)
+
+    def classify(self, text: str) -> Tuple[Optional[bool], str]:
+        """
+        Classifies a line with the cheap rules.
+
+        :param text: the input line.
+        :return: the decision (True: Tetun, False: not Tetun, None: uncertain) and the rule applied.
+        """
+
+        text = text.strip()
+        if not text:
+            return False, "empty"
+        if LETTER_PATTERN.search(text) is None:
+            return False, "no_letters"
+        if URL_PATTERN.match(text):
+            return False, "url"
+
+        tokens = WORD_PATTERN.findall(text.lower())
+        if len(tokens) < self.min_tokens:
+            return None, "uncertain"
+
+        tetun_hits = sum(token in TETUN_STOPWORDS for token in tokens)
+        foreign_hits = sum(token in FOREIGN_STOPWORDS for token in tokens)
+        if (tetun_hits == 0 and foreign_hits >= self.min_foreign_hits
+                and foreign_hits / len(tokens) >= self.reject_ratio):
+            return False, "foreign_stopwords"
+        if self.accept_tetun and foreign_hits == 0 and tetun_hits / len(tokens) >= self.accept_ratio:
+            return True, "tetun_stopwords"
+
+        return None, "uncertain"
+
+    def classify_batch(self, input_text: List[str]) -> Tuple[List[Optional[bool]], Dict[int, str]]:
+        """
+        Classifies a list of lines and selects the decided lines to be audited.
+
+        :param input_text: a list of string.
+        :return: the decisions and a dictionary of the audited line indexes with their rule.
+        """
+
+        decisions = []
+        audited = {}
+        for i, text in enumerate(input_text):
+            decision, rule = self.classify(text)
+            decisions.append(decision)
+            self.total_lines += 1
+            self.rule_counts[rule] += 1
+            if decision is not None:
+                self.decided_lines += 1
+                if self.audit_stride and self.decided_lines % self.audit_stride == 0:
+                    audited[i] = rule
+
+        return decisions, audited
+
+    def record_audit(self, rule: str, decision: bool, model_decision: bool) -> None:
+        """ Records whether the LID model agrees with the decision taken by a rule. """
+
+        self.audit_counts[rule] += 1
+        if decision == model_decision:
+            self.agreement_counts[rule] += 1
+
+    def log_stats(self) -> None:
+        """ Logs how many lines were decided by each rule and their agreement with the LID model. """
+
+        if self.total_lines == 0:
+            return
+        logging.info(
+            f"LID pre-classifier decided {self.decided_lines} of {self.total_lines} lines "
+            f"({self.decided_lines / self.total_lines:.2%}), "
+            f"{self.total_lines - self.decided_lines} lines were sent to the LID model.")
+        for rule, count in sorted(self.rule_counts.items(), key=lambda x: x[1], reverse=True):
+            audited = self.audit_counts.get(rule, 0)
+            agreement = f"{self.agreement_counts[rule] / audited:.2%}" if audited else "n/a"
+            logging.info(
+                f"Rule: {rule}, lines: {count}, audited: {audited}, agreement with the LID model: {agreement}")
@@ -0,0 +1,219 @@
+import os
+import hashlib
+import joblib
+import sklearn
+import numpy as np
+import scipy.sparse as sp
+from typing import List, Optional
+from sklearn.pipeline import Pipeline
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+""" This module exports the LID model into a memory-mappable layout and loads it back. """
+
+MODEL_FILE = "model.joblib"
+HASHES_FILE = "vocabulary_hashes.npy"
+INDICES_FILE = "vocabulary_indices.npy"
+TERMS_FILE = "vocabulary_terms.npy"
+OFFSETS_FILE = "vocabulary_offsets.npy"
+VERSION_FILE = "sklearn_version.txt"
+
+
+def hash_terms(encoded_terms: List[bytes]) -> np.ndarray:
+    """ Returns the 64-bit hashes of UTF-8 encoded terms, stable across processes (unlike the built-in hash). """
+
+    digests = b"".join([hashlib.blake2b(term, digest_size=8).digest() for term in encoded_terms])
+    return np.frombuffer(digests, dtype="<u8").astype(np.uint64)
+
+
+def get_vectorizer(model: object) -> Optional[CountVectorizer]:
+    """ Returns the text vectorizer if the model is a pipeline starting with a (Count|Tfidf)Vectorizer. """
+
+    if isinstance(model, Pipeline) and len(model.steps) > 1 and isinstance(model.steps[0][1], CountVectorizer):
+        return model.steps[0][1]
+    return None
+
+
+def export_mmap_model(model: object, export_dir: str) -> None:
+    """
+    Exports the LID model into a folder that can be memory-mapped:
+    (1) The vocabulary of the vectorizer is saved as a hash table of NumPy arrays: the sorted term hashes,
+        their feature indexes, and the terms as one UTF-8 buffer with their offsets.
+    (2) The model without the vocabulary is saved uncompressed, so its NumPy arrays (e.g. coefficients) can be memory-mapped.
+
+    :param model: the fitted LID model.
+    :param export_dir: the folder where the model is exported.
+    """
+
+    os.makedirs(export_dir, exist_ok=True)
+    vectorizer = get_vectorizer(model)
+    if vectorizer is None or not vectorizer.vocabulary_:
+        joblib.dump(model, os.path.join(export_dir, MODEL_FILE))
+        return
+
+    # The vocabulary is saved as a hash table: the sorted hashes of the terms, their feature indexes,
+    # and the terms in the same order, concatenated into one UTF-8 buffer with their offsets.
+    vocabulary = vectorizer.vocabulary_
+    terms = list(vocabulary)
+    hashes = hash_terms([term.encode("utf-8") for term in terms])
+    order = np.argsort(hashes, kind="stable")
+    hashes = hashes[order]
+    terms = [terms[i] for i in order]
+    if np.any(hashes[1:] == hashes[:-1]):
+        raise ValueError("Two terms of the vocabulary have the same hash, the model cannot be exported.")
+    encoded_terms = [term.encode("utf-8") for term in terms]
+    offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    np.cumsum([len(term) for term in encoded_terms], out=offsets[1:])
+    np.save(os.path.join(export_dir, HASHES_FILE), hashes)
+    np.save(os.path.join(export_dir, INDICES_FILE),
+            np.array([vocabulary[term] for term in terms], dtype=np.int64))
+    np.save(os.path.join(export_dir, TERMS_FILE), np.frombuffer(b"".join(encoded_terms), dtype=np.uint8))
+    np.save(os.path.join(export_dir, OFFSETS_FILE), offsets)
+    with open(os.path.join(export_dir, VERSION_FILE), "w", encoding="utf-8") as version_file:
+        version_file.write(sklearn.__version__)
+
+    # The vocabulary and the stop words are saved as arrays or not needed for predictions.
+    stop_words = getattr(vectorizer, "stop_words_", None)
+    vectorizer.vocabulary_ = {}
+    vectorizer.stop_words_ = None
+    try:
+        joblib.dump(model, os.path.join(export_dir, MODEL_FILE))
+    finally:
+        vectorizer.vocabulary_ = vocabulary
+        vectorizer.stop_words_ = stop_words
+
+
+class MmapLidModel:
+    """
+    Memory-mapped LID model class loads a model exported by `export_mmap_model`.
+
+    The arrays are opened with `mmap_mode`, so the processes loading the same model share
+    one copy of it in the page cache. The unique features of each batch are looked up with a
+    binary search on the sorted term hashes, the term found is then compared with the searched
+    one, and the predictions are identical to the ones of the original model.
+
+    The TF-IDF weighting relies on the private `_tfidf` attribute of the vectorizer, so the model
+    is only loaded with the scikit-learn version it was exported with.
+    """
+
+    def __init__(self, export_dir: str) -> None:
+        self.model = joblib.load(os.path.join(export_dir, MODEL_FILE), mmap_mode="r")
+        self.classes_ = self.model.classes_
+        self.vectorizer = get_vectorizer(self.model)
+        self.hashes = None
+        hashes_path = os.path.join(export_dir, HASHES_FILE)
+        if self.vectorizer is not None and os.path.exists(hashes_path):
+            with open(os.path.join(export_dir, VERSION_FILE), "r", encoding="utf-8") as version_file:
+                export_version = version_file.read().strip()
+            if export_version != sklearn.__version__:
+                raise ValueError(
+                    f"The LID model was exported with scikit-learn {export_version} and cannot be loaded with "
+                    f"scikit-learn {sklearn.__version__}, export it again.")
+            if isinstance(self.vectorizer, TfidfVectorizer) and not hasattr(self.vectorizer, "_tfidf"):
+                raise ValueError(
+                    f"The TfidfVectorizer of scikit-learn {sklearn.__version__} is not supported by the memory-mapped model.")
+            # The arrays are mapped once, their plain ndarray views avoid the overhead of np.memmap indexing.
+            self.hashes = np.asarray(np.load(hashes_path, mmap_mode="r"))
+            self.indices = np.asarray(np.load(os.path.join(export_dir, INDICES_FILE), mmap_mode="r"))
+            self.terms = np.asarray(np.load(os.path.join(export_dir, TERMS_FILE), mmap_mode="r"))
+            self.offsets = np.asarray(np.load(os.path.join(export_dir, OFFSETS_FILE), mmap_mode="r"))
+            self.analyzer = self.vectorizer.build_analyzer()
+
+    def get_feature_indices(self, features: List[str]) -> np.ndarray:
+        """
+        Looks up the unique features of a batch in the vocabulary.
+
+        :param features: a list of unique features.
+        :return: the feature index of each feature in the vocabulary, -1 if it is not in the vocabulary.
+        """
+
+        feature_indices = np.full(len(features), -1, dtype=np.int64)
+        if not features or len(self.hashes) == 0:
+            return feature_indices
+
+        encoded_features = [feature.encode("utf-8") for feature in features]
+        feature_lengths = np.fromiter(map(len, encoded_features), dtype=np.int64, count=len(features))
+        feature_hashes = hash_terms(encoded_features)
+        positions = np.searchsorted(self.hashes, feature_hashes)
+        positions[positions == len(self.hashes)] = 0
+        # The vocabulary has no empty term, so the empty features are left out.
+        candidates = np.flatnonzero(
+            (self.hashes[positions] == feature_hashes) & (feature_lengths > 0)
+            & (self.offsets[positions + 1] - self.offsets[positions] == feature_lengths))
+        if len(candidates) == 0:
+            return feature_indices
+
+        # A feature out of the vocabulary may share the hash of a term, so the bytes of each term found are
+        # compared with the feature at once: the term bytes are gathered in the order of the features.
+        lengths = feature_lengths[candidates]
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        gather = np.arange(ends[-1]) + np.repeat(self.offsets[positions[candidates]] - starts, lengths)
+        feature_bytes = np.frombuffer(b"".join([encoded_features[i] for i in candidates]), dtype=np.uint8)
+        same_bytes = np.logical_and.reduceat(self.terms[gather] == feature_bytes, starts)
+        matches = candidates[same_bytes]
+        feature_indices[matches] = self.indices[positions[matches]]
+
+        return feature_indices
+
+        feature_hashes = np.fromiter((hash_term(feature) for feature in features), dtype=np.uint64, count=len(features))
+        positions = np.searchsorted(self.hashes, feature_hashes)
+        positions[positions == len(self.hashes)] = 0
+        # A feature out of the vocabulary may share the hash of a term, so the term found is compared with it.
+        terms = self.terms
+        offsets = self.offsets
+        for i in np.flatnonzero(self.hashes[positions] == feature_hashes):
+            position = positions[i]
+            if terms[offsets[position]:offsets[position + 1]].tobytes() == features[i].encode("utf-8"):
+                feature_indices[i] = self.indices[position]
+
+        return feature_indices
+
+    def transform(self, input_text: List[str]) -> sp.csr_matrix:
+        """ Vectorizes the input text as the vectorizer of the original model does. """
+
+        # Each unique feature of the batch is looked up once, the occurrences keep its position.
+        unique_features = {}
+        occurrences = []
+        indptr = [0]
+        for text in input_text:
+            occurrences.extend(
+                unique_features.setdefault(feature, len(unique_features)) for feature in self.analyzer(text))
+            indptr.append(len(occurrences))
+
+        feature_indices = self.get_feature_indices(list(unique_features))
+        columns = feature_indices[np.array(occurrences, dtype=np.int64)]
+        found = columns >= 0
+        rows = np.repeat(np.arange(len(input_text)), np.diff(indptr))
+
+        matrix = sp.csr_matrix(
+            (np.ones(found.sum(), dtype=self.vectorizer.dtype), (rows[found], columns[found])),
+            shape=(len(input_text), len(self.indices)),
+            dtype=self.vectorizer.dtype
+        )
+        matrix.sum_duplicates()
+        matrix.sort_indices()
+        if self.vectorizer.binary:
+            matrix.data.fill(1)
+        if isinstance(self.vectorizer, TfidfVectorizer):
+            matrix = self.vectorizer._tfidf.transform(matrix, copy=False)
+
+        return matrix
+
+    def predict_proba(self, input_text: List[str]) -> np.ndarray:
+        """ Returns the probability of each class for each input text. """
+
+        if self.hashes is None:
+            return self.model.predict_proba(input_text)
+
+        features = self.transform(input_text)
+        for _, step in self.model.steps[1:-1]:
+            if step is not None and step != "passthrough":
+                features = step.transform(features)
+
+        return self.model.steps[-1][1].predict_proba(features)
+
+
+def verify_mmap_model(model: object, mmap_model: MmapLidModel, input_text: List[str]) -> bool:
+    """ Checks that the memory-mapped model gives the same predictions as the original model. """
+
+    return np.array_equal(model.predict_proba(input_text), mmap_model.predict_proba(input_text))
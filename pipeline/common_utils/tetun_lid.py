@@ -1,46 +1,112 @@
 import os
-import joblib
-from typing import List
+from typing import Dict, List
 from pathlib import Path
+from common_utils.lid_cascade import LidPreClassifier
+
+# The LID models loaded by the process, shared by all the stages running in it.
+LID_MODELS: Dict[str, object] = {}
 
 
 class TetunLid:
     """
-    Tetun LID class loads the LID model file, applies it to the input text, 
+    Tetun LID class loads the LID model file, applies it to the input text,
     and then filters out texts that do not meet the predefined threshold.
+
+    If a pre-classifier is given, the obvious texts are decided by it and only
+    the uncertain ones are sent to the LID model.
     """
 
     def __init__(
-        self, tetun_lang: str, lang_proba_threshold: float, lid_model_file_path: str,
+        self,
+        tetun_lang: str,
+        lang_proba_threshold: float,
+        lid_model_file_path: str,
+        pre_classifier: LidPreClassifier = None,
     ) -> None:
         self.tetun_lang = tetun_lang
         self.lang_proba_threshold = lang_proba_threshold
         self.lid_model_file_path = lid_model_file_path
+        self.pre_classifier = pre_classifier
+        self.model = None
 
     def load_lid_model(self) -> object:
-        """ Loads  and return the language identification (LID) model. """
+        """
+        Loads  and return the language identification (LID) model. If the path is a folder,
+        the memory-mapped model exported by `export_lid_model.py` is loaded.
+        """
 
-        if not os.path.exists(self.lid_model_file_path):
-            print(f"Model file not found at: {self.lid_model_file_path}")
+        if self.model is not None:
+            return self.model
+        model_path = str(self.lid_model_file_path)
+        if model_path in LID_MODELS:
+            self.model = LID_MODELS[model_path]
+            return self.model
+        if not os.path.exists(model_path):
+            print(f"Model file not found at: {model_path}")
             return []
-        model = joblib.load(Path(self.lid_model_file_path))
+        if os.path.isdir(model_path):
+            from common_utils.lid_model_export import MmapLidModel
+            self.model = MmapLidModel(model_path)
+        else:
+            import joblib
+            self.model = joblib.load(Path(model_path))
+        LID_MODELS[model_path] = self.model
 
-        return model
+        return self.model
 
-    def get_tetun_text(self, input_text: List[str]) -> List[str]:
+    def predict_tetun(self, input_text: List[str]) -> List[bool]:
         """
-        Gets Tetun words with a probability >= threshold. 
+        Applies the LID model to the input text.
 
         :param input_text: a list of string.
-        :return: a list of texts.
+        :return: a list of booleans, True if the text is Tetun with a probability >= threshold.
         """
 
-        tetun_text = []
+        if not input_text:
+            return []
         tetun_lid_model = self.load_lid_model()
         pred_probs = tetun_lid_model.predict_proba(input_text)
-        for i, probs in enumerate(pred_probs):
-            for j, lang in enumerate(tetun_lid_model.classes_):
-                if lang == self.tetun_lang and round(probs[j], 2) >= self.lang_proba_threshold:
-                    tetun_text.append(input_text[i])
+        tetun_index = list(tetun_lid_model.classes_).index(self.tetun_lang)
+
+        return [round(probs[tetun_index], 2) >= self.lang_proba_threshold for probs in pred_probs]
+
+    def predict_tetun_cascade(self, input_text: List[str]) -> List[bool]:
+        """
+        Applies the pre-classifier to the input text and the LID model to the uncertain texts.
+
+        :param input_text: a list of string.
+        :return: a list of booleans, True if the text is Tetun.
+        """
+
+        if self.pre_classifier is None:
+            return self.predict_tetun(input_text)
+
+        decisions, audited = self.pre_classifier.classify_batch(input_text)
+        model_indexes = [i for i, decision in enumerate(decisions) if decision is None or i in audited]
+        model_decisions = self.predict_tetun([input_text[i] for i in model_indexes])
+        for i, model_decision in zip(model_indexes, model_decisions):
+            if decisions[i] is None:
+                decisions[i] = model_decision
+            else:
+                self.pre_classifier.record_audit(audited[i], decisions[i], model_decision)
+
+        return decisions
+
+    def get_tetun_text(self, input_text: List[str]) -> List[str]:
+        """
+        Gets Tetun words with a probability >= threshold.
+
+        :param input_text: a list of string.
+        :return: a list of texts.
+        """
+
+        is_tetun = self.predict_tetun_cascade(input_text)
+        tetun_text = [text for text, keep in zip(input_text, is_tetun) if keep]
 
         return tetun_text
+
+    def log_stats(self) -> None:
+        """ Logs the statistics of the pre-classifier, if any. """
+
+        if self.pre_classifier is not None:
+            self.pre_classifier.log_stats()
@@ -0,0 +1,47 @@
+import re
+import html
+import unicodedata
+from typing import List
+
+TAG_PATTERN = re.compile(r"<.*?>")
+NEWLINE_PATTERN = re.compile(r"\r\n?")
+
+
+class TextCleaner:
+    """
+    Text cleaner class cleans the whole content of a page in a single pass before it is split into lines:
+    (1) Removes the HTML tags and unescapes the HTML entities.
+    (2) Normalizes the Unicode characters (NFC) and strips each line, as the former per-line cleaning did.
+    (3) Collapses the runs of empty lines, keeping at most the predefined number of consecutive newlines.
+    """
+
+    def __init__(self, max_consecutive_newlines: int) -> None:
+        self.max_consecutive_newlines = max(max_consecutive_newlines, 1)
+        self.blank_run = "\n" * (self.max_consecutive_newlines + 1)
+
+    def clean_text(self, content: str) -> str:
+        """ Cleans the content and returns it as a single string. """
+
+        # The substring checks skip the patterns that cannot match, which is the common case.
+        text = TAG_PATTERN.sub("", content) if "<" in content else content
+        text = html.unescape(text)
+        text = unicodedata.normalize("NFC", text)
+        if "\r" in text:
+            text = NEWLINE_PATTERN.sub("\n", text)
+        # Stripping each line is faster than a regular expression, the inner whitespaces are kept.
+        text = "\n".join([line.strip() for line in text.split("\n")]).strip("\n")
+        # Each replacement shortens the runs of empty lines, faster than a regular expression.
+        while self.blank_run in text:
+            text = text.replace(self.blank_run, self.blank_run[1:])
+
+        return text
+
+    def clean_document(self, content: str) -> List[str]:
+        """
+        Cleans the content of a page.
+
+        :param content: the page content.
+        :return: a list of the cleaned lines.
+        """
+
+        return self.clean_text(content).split("\n")
@@ -1,7 +1,7 @@
 import os
-import tldextract
 import re
 import html
+from functools import lru_cache
 from typing import List
 
 
@@ -77,6 +77,27 @@ def get_file_path(path: str, file: str) -> str:
             f"The file or folder '{file_path}' does not exist.")
 
 
+def get_lid_model_path(cfg) -> str:
+    """
+    Function to get the path of the LID model, either the pickle or the memory-mapped model folder.
+
+    :param cfg: the pipeline configuration.
+    :return: the LID model path.
+    """
+    if cfg.params.lid_use_mmap_model:
+        return get_file_path(cfg.paths.lid, cfg.files.lid_mmap_model)
+    return get_file_path(cfg.paths.lid, cfg.files.lid_model)
+
+
+@lru_cache(maxsize=None)
+def get_domain_extractor() -> callable:
+    """ Imports tldextract on first use and returns its extractor, shared by all the stages of the process. """
+    import tldextract
+
+    return tldextract.extract
+
+
+@lru_cache(maxsize=100000)
 def extract_domain(seed_url: str) -> str:
     """
     Gets the domain name from an url.
@@ -84,7 +105,7 @@ def extract_domain(seed_url: str) -> str:
     :param seed_url: the input url.
     :return: the domain or domain with subdomain name.
     """
-    exctracted = tldextract.extract(seed_url)
+    exctracted = get_domain_extractor()(seed_url)
     domain = exctracted.registered_domain
     subdomain = exctracted.subdomain
     if subdomain:
@@ -93,9 +114,30 @@ def extract_domain(seed_url: str) -> str:
     return domain
 
 
+def get_extension(url: str) -> str:
+    """
+    Gets the file extension from an url, the MS. Office extensions are uniformized.
+
+    :param url: the input url.
+    :return: the lowercase extension with its dot, or an empty string.
+    """
+    filename = os.path.basename(url)
+    extension = os.path.splitext(filename)[1].lower() if '.' in filename else ''
+    if extension == '.doc':
+        extension = '.docx'
+    elif extension == '.xls':
+        extension = '.xlsx'
+    elif extension in ['.ppt', '.pps', '.ppsx']:
+        extension = '.pptx'
+
+    return extension
+
+
+HTML_TAG_PATTERN = re.compile('<.*?>')
+
+
 def remove_html_tags(text: str) -> str:
-    """ Remove HTML tags found on the given text. """
-    clean = re.compile('<.*?>')
-    text = re.sub(clean, '', text)
+    """ Remove HTML tags found on the given text (the former per-line cleaning, kept for the benchmark). """
+    text = HTML_TAG_PATTERN.sub('', text)
     clean_text = html.unescape(text)
     return clean_text
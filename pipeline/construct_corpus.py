@@ -1,8 +1,9 @@
-import hydra
-from hydra.core.config_store import ConfigStore
+import os
 from common_utils.config import PipelineConfig
-from common_utils.utils import get_file_path
+from common_utils.utils import get_file_path, get_lid_model_path
 from src.get_corpus import GetCorpus
+from src.document_source import build_solr_filter_queries, get_document_source
+from common_utils.lid_cascade import LidPreClassifier
 import warnings
 
 warnings.filterwarnings("ignore", category=UserWarning)
@@ -12,15 +13,47 @@ class ConstructCorpus:
     """ This class generates text pages for the Tetun corpus and save them in a file. """
 
     def __init__(self, cfg) -> None:
-        self.get_corpus = GetCorpus(
+        dump_file_path = None
+        if cfg.params.document_source != "solr":
+            dump_file_path = get_file_path(cfg.paths.data, cfg.files.document_dump)
+        solr_filter_queries = None
+        if cfg.params.solr_push_down_filters:
+            solr_filter_queries = build_solr_filter_queries(
+                cfg.params.solr_url_field,
+                cfg.params.solr_content_field,
+                cfg.params.url_exclude_substrings,
+                cfg.params.language
+            )
+        document_source = get_document_source(
+            cfg.params.document_source,
             cfg.params.solr_api_url,
             cfg.params.solr_start,
             cfg.params.solr_rows,
+            dump_file_path,
+            solr_filter_queries,
+            cfg.params.solr_host_field
+        )
+        lid_pre_classifier = None
+        if cfg.params.lid_cascade:
+            lid_pre_classifier = LidPreClassifier(
+                cfg.params.lid_cascade_min_tokens,
+                cfg.params.lid_cascade_accept_ratio,
+                cfg.params.lid_cascade_reject_ratio,
+                cfg.params.lid_cascade_min_foreign_hits,
+                cfg.params.lid_cascade_accept,
+                cfg.params.lid_cascade_audit_ratio
+            )
+        self.get_corpus = GetCorpus(
+            document_source,
             cfg.params.max_consecutive_newline,
             cfg.params.language,
             cfg.params.lang_proba_threshold,
-            get_file_path(cfg.paths.lid, cfg.files.lid_model),
-            get_file_path(cfg.paths.data, cfg.files.final_corpus)
+            get_lid_model_path(cfg),
+            get_file_path(cfg.paths.data, cfg.files.final_corpus),
+            lid_pre_classifier,
+            cfg.params.lid_batch_size,
+            os.path.join(cfg.paths.data, cfg.files.corpus_stats),
+            cfg.params.url_exclude_substrings
         )
 
     def run(self) -> None:
@@ -31,9 +64,13 @@ class ConstructCorpus:
             print(f"\nError while generating the final corpus: {e}\n")
 
 
-cs = ConfigStore.instance()
-cs.store(name="pipeline_config", node=PipelineConfig)
 if __name__ == "__main__":
+    import hydra
+    from hydra.core.config_store import ConfigStore
+
+    cs = ConfigStore.instance()
+    cs.store(name="pipeline_config", node=PipelineConfig)
+
     @hydra.main(config_path="conf", config_name="config")
     def main(cfg: PipelineConfig):
         construct_corpus = ConstructCorpus(cfg)
@@ -0,0 +1,67 @@
+import os
+import sys
+import shutil
+import joblib
+import random
+import tempfile
+from common_utils.config import PipelineConfig
+from common_utils.utils import Utils, get_file_path
+from common_utils.lid_model_export import MmapLidModel, export_mmap_model, verify_mmap_model
+import warnings
+
+warnings.filterwarnings("ignore", category=UserWarning)
+
+
+class ExportLidModel:
+    """ This class exports the LID model into a memory-mapped folder and verifies its predictions. """
+
+    def __init__(self, cfg) -> None:
+        self.lid_model_file_path = get_file_path(cfg.paths.lid, cfg.files.lid_model)
+        self.lid_mmap_model_path = os.path.join(cfg.paths.lid, cfg.files.lid_mmap_model)
+        self.main_corpus = Utils(get_file_path(cfg.paths.data, cfg.files.main_corpus))
+        self.verify_lines = cfg.params.lid_export_verify_lines
+
+    def run(self) -> None:
+        """
+        Exports the LID model into a temporary folder next to the final one, and replaces the final
+        folder only if the predictions are identical. Exits with an error status otherwise.
+        """
+
+        model = joblib.load(self.lid_model_file_path)
+        parent_dir = os.path.dirname(os.path.abspath(self.lid_mmap_model_path))
+        os.makedirs(parent_dir, exist_ok=True)
+        export_dir = tempfile.mkdtemp(prefix=".lid_model_export_", dir=parent_dir)
+        try:
+            export_mmap_model(model, export_dir)
+            corpus = self.main_corpus.load_corpus()
+            sample = random.sample(corpus, min(self.verify_lines, len(corpus)))
+            is_identical = verify_mmap_model(model, MmapLidModel(export_dir), sample)
+        except Exception:
+            shutil.rmtree(export_dir, ignore_errors=True)
+            raise
+
+        if not is_identical:
+            shutil.rmtree(export_dir, ignore_errors=True)
+            print(f"\nError: the predictions of the exported LID model differ from the original model, "
+                  f"{self.lid_mmap_model_path} was not updated.\n")
+            sys.exit(1)
+
+        if os.path.isdir(self.lid_mmap_model_path):
+            shutil.rmtree(self.lid_mmap_model_path)
+        os.replace(export_dir, self.lid_mmap_model_path)
+        print(f"\nThe LID model has been exported to: {self.lid_mmap_model_path}")
+        print(f"The predictions are identical on {len(sample)} lines of the initial corpus.\n\n")
+
+if __name__ == "__main__":
+    import hydra
+    from hydra.core.config_store import ConfigStore
+
+    cs = ConfigStore.instance()
+    cs.store(name="pipeline_config", node=PipelineConfig)
+
+    @hydra.main(config_path="conf", config_name="config")
+    def main(cfg: PipelineConfig):
+        export_lid_model = ExportLidModel(cfg)
+        export_lid_model.run()
+
+    main()
@@ -0,0 +1,47 @@
+import os
+from common_utils.config import PipelineConfig
+from common_utils.utils import get_file_path
+from src.crawl_feedback import CrawlFeedback
+import warnings
+
+warnings.filterwarnings("ignore", category=UserWarning)
+
+
+class GenerateCrawlFeedback:
+    """ This class feeds the Tetun yield of each domain back to the Nutch seeds and the seeder. """
+
+    def __init__(self, cfg) -> None:
+        self.crawl_feedback = CrawlFeedback(
+            os.path.join(cfg.paths.data, cfg.files.corpus_stats),
+            get_file_path(cfg.paths.nutch, cfg.files.nutch_seed_url),
+            os.path.join(cfg.paths.data, cfg.files.ranked_domain),
+            os.path.join(cfg.paths.data, cfg.files.pruned_domain),
+            os.path.join(cfg.paths.nutch_conf, cfg.files.nutch_url_filter),
+            cfg.params.feedback_min_fetched_docs,
+            cfg.params.feedback_min_yield,
+            cfg.params.feedback_unknown_score,
+            cfg.params.feedback_min_fetch_interval,
+            cfg.params.feedback_max_fetch_interval
+        )
+
+    def run(self) -> None:
+        try:
+            self.crawl_feedback.generate_feedback()
+            print("\nThe crawl feedback has been generated successfully.\n\n")
+        except Exception as e:
+            print(f"\nError while generating the crawl feedback: {e}\n")
+
+
+if __name__ == "__main__":
+    import hydra
+    from hydra.core.config_store import ConfigStore
+
+    cs = ConfigStore.instance()
+    cs.store(name="pipeline_config", node=PipelineConfig)
+
+    @hydra.main(config_path="conf", config_name="config")
+    def main(cfg: PipelineConfig):
+        generate_crawl_feedback = GenerateCrawlFeedback(cfg)
+        generate_crawl_feedback.run()
+
+    main()
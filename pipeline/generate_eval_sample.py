@@ -1,5 +1,3 @@
-import hydra
-from hydra.core.config_store import ConfigStore
 from common_utils.config import PipelineConfig
 from common_utils.utils import get_file_path
 from src.get_sample_corpus import GetSampleCorpus
@@ -26,9 +24,13 @@ class GenerateEvalSample:
             print(f"Insuficient sample: {e}")
 
 
-cs = ConfigStore.instance()
-cs.store(name="pipeline_config", node=PipelineConfig)
 if __name__ == "__main__":
+    import hydra
+    from hydra.core.config_store import ConfigStore
+
+    cs = ConfigStore.instance()
+    cs.store(name="pipeline_config", node=PipelineConfig)
+
     @hydra.main(config_path="conf", config_name="config")
     def main(cfg: PipelineConfig):
         eval_samples = GenerateEvalSample(cfg)
@@ -1,9 +1,9 @@
-import hydra
+import os
 from src.get_seed_url import GetSeedUrl
 from src.get_seed_word import GetSeedWords
-from hydra.core.config_store import ConfigStore
+from src.search_backend import ConcurrentSearch, get_search_backend
 from common_utils.config import PipelineConfig
-from common_utils.utils import get_file_path
+from common_utils.utils import Utils, get_file_path, get_lid_model_path
 import warnings
 
 warnings.filterwarnings("ignore", category=UserWarning)
@@ -17,21 +17,42 @@ class MainSeeder:
             get_file_path(cfg.paths.data, cfg.files.main_corpus),
             cfg.params.language,
             cfg.params.corpus_sample_ratio,
-            get_file_path(cfg.paths.lid, cfg.files.lid_model),
+            get_lid_model_path(cfg),
             cfg.params.lang_proba_threshold,
             cfg.params.num_seed_word_sample,
             get_file_path(cfg.paths.data, cfg.files.seed_words)
         )
+        search_location = cfg.params.search_backend_location
+        if cfg.params.search_backend == "file":
+            search_location = get_file_path(cfg.paths.data, search_location)
+        search = ConcurrentSearch(
+            get_search_backend(cfg.params.search_backend, search_location),
+            cfg.params.search_max_workers,
+            cfg.params.search_min_interval,
+            cfg.params.search_max_retries,
+            cfg.params.search_backoff_factor
+        )
         self.get_url = GetSeedUrl(
             cfg.params.extensions_to_exclude,
             cfg.params.domains_to_exclude,
-            self.get_seed_word.generate_seed_words(),
+            self.get_seed_word.generate_seed_word_queries(cfg.params.num_seed_queries),
+            search,
             cfg.params.google_search_num_result,
             cfg.params.max_seed_url_length,
             get_file_path(cfg.paths.nutch, cfg.files.nutch_seed_url),
-            get_file_path(cfg.paths.data, cfg.files.domain)
+            get_file_path(cfg.paths.data, cfg.files.domain),
+            self.load_pruned_domains(cfg)
         )
 
+    @staticmethod
+    def load_pruned_domains(cfg) -> list:
+        """ Loads the domains pruned by the crawl feedback, if any. """
+
+        pruned_domain_file_path = os.path.join(cfg.paths.data, cfg.files.pruned_domain)
+        if not os.path.exists(pruned_domain_file_path):
+            return []
+        return Utils(pruned_domain_file_path).load_corpus()
+
     def run(self) -> None:
         try:
             self.get_url.generate_seed_urls()
@@ -40,9 +61,13 @@ class MainSeeder:
             print(f"\nError while generating the seed URLs: {e}\n")
 
 
-cs = ConfigStore.instance()
-cs.store(name="pipeline_config", node=PipelineConfig)
 if __name__ == "__main__":
+    import hydra
+    from hydra.core.config_store import ConfigStore
+
+    cs = ConfigStore.instance()
+    cs.store(name="pipeline_config", node=PipelineConfig)
+
     @hydra.main(config_path="conf", config_name="config")
     def main(cfg: PipelineConfig):
         seeder = MainSeeder(cfg)
@@ -1,13 +1,9 @@
-import os
-import requests
-import numpy as np
 import logging
 import warnings
 from pathlib import Path
-from bs4 import BeautifulSoup
-from bs4.builder import ParserRejectedMarkup
-from requests import exceptions
+from typing import Dict, List
 from common_utils.utils import Utils, extract_domain
+from src.corpus_stat import CorpusStatistic, get_total_stats, load_corpus_stats
 
 warnings.filterwarnings("ignore")
 
@@ -15,120 +11,160 @@ warnings.filterwarnings("ignore")
 class CollectionStatistic:
     """ 
     This class generates the corpus summary comprises:
-    (1) Total inlinks and outlinks per document (url).
-    (2) Total documents.  
-    (3) Total documents per domain.
-    (4) Total documents per extension.
+    (1) Total documents, lines and characters, and the Tetun acceptance rates.
+    (2) Total documents per domain.
+    (3) Total documents per extension.
+    (4) Optionally, total inlinks and outlinks per document (url).
+
+    The statistics (1-3) are read from the statistics file kept during the corpus construction,
+    the final corpus is only scanned if that file does not exist or to get the inlinks and outlinks.
     """
 
     def __init__(
         self,
         final_corpus_file_path: Path,
         url_in_out_links_file_path: Path,
-        stats_in_out_links_file_path: Path
+        stats_in_out_links_file_path: Path,
+        corpus_stats_file_path: Path,
+        collect_link_stats: bool = True
     ) -> None:
         self.final_corpus_file_path = Utils(final_corpus_file_path)
         self.url_in_out_links = Utils(url_in_out_links_file_path)
         self.stats_in_out_links_file_path = Utils(stats_in_out_links_file_path)
+        self.corpus_stats_file_path = corpus_stats_file_path
+        self.collect_link_stats = collect_link_stats
         logging.basicConfig(
             level=logging.DEBUG,
             format="%(asctime)s %(levelname)s: %(message)s"
         )
 
-    def generate_stats(self) -> None:
-        """ Load the final corpus and get the URLs, extract domains and extensions as well as inlinks and outlinks. """
+    def get_corpus_urls(self) -> List[str]:
+        """ Load the final corpus and get the URL of each document. """
 
-        logging.info("Generating statistics for the collection...")
         corpus = self.final_corpus_file_path.load_final_corpus()
-        domain_counts = {}
-        extension_counts = {}
-        outlink_count_list = []
-        inlink_count_list = []
-        total_documents = 0
+        urls = []
         for conten in corpus.split('\n\n'):
             try:
-                url = conten.split('\n')[1].strip()
-                total_documents += 1
-                # Domains
-                domain = extract_domain(url)
-                if domain in domain_counts:
-                    domain_counts[domain] += 1
-                else:
-                    domain_counts[domain] = 1
-
-                # Extensions - extract the last part of the URL
-                filename = os.path.basename(url)
-                extension = os.path.splitext(
-                    filename)[1].lower() if '.' in filename else ''
-                # Uniformize the MS. Office extensions
-                if extension == 'doc':
-                    extension = 'docx'
-                elif extension == 'xls':
-                    extension = 'xlsx'
-                elif extension in ['ppt', 'pps', 'ppsx']:
-                    extension = 'pptx'
-
-                if extension in extension_counts:
-                    extension_counts[extension] += 1
-                else:
-                    extension_counts[extension] = 1
-
-                try:
-                    # Outlinks and Inlinks for each URL
-                    response = requests.get(url)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        links = soup.find_all('a')
-
-                        outlink_count = 0
-                        inlink_count = 0
-                        for link in links:
-                            href = link.get('href')
-                            if href and (href.startswith('http://') or href.startswith('https://')):
-                                if domain not in href:
-                                    outlink_count += 1
-                                else:
-                                    inlink_count += 1
-                            elif href and not href.startswith('#'):
-                                inlink_count += 1
-
-                        outlink_count_list.append(outlink_count)
-                        inlink_count_list.append(inlink_count)
-                        self.url_in_out_links.save_corpus(
-                            f"Url: {url}, Outlink: {outlink_count}, Inlink: {inlink_count}")
-                    else:
-                        continue
-                except (exceptions.RequestException, exceptions.ConnectionError, exceptions.HTTPError, exceptions.Timeout,
-                        exceptions.TooManyRedirects, exceptions.URLRequired, ParserRejectedMarkup, AssertionError):
-                    continue
+                urls.append(conten.split('\n')[1].strip())
             except IndexError:
                 continue
 
-        # Save the inlinks and outlinks summary
-        stat_inlinks_outlinks = f""" Statistics of the collection:
+        return urls
+
+    def scan_corpus(self) -> Dict:
+        """ Load the final corpus and count the documents, lines and characters per domain and extension. """
+
+        corpus_stat = CorpusStatistic(self.corpus_stats_file_path)
+        corpus_stat.add_final_corpus(self.final_corpus_file_path.load_final_corpus() or "")
+
+        return {"domains": corpus_stat.domains, "extensions": corpus_stat.extensions}
+
+    def generate_stats(self) -> None:
+        """ Load the collection statistics and save their summary, as well as the inlinks and outlinks if enabled. """
+
+        logging.info("Generating statistics for the collection...")
+        stats = load_corpus_stats(self.corpus_stats_file_path)
+        if not stats["domains"]:
+            logging.warning(
+                f"No statistics found at: {self.corpus_stats_file_path}, scanning the final corpus...")
+            stats = self.scan_corpus()
+
+        totals = get_total_stats(stats)
+        stat_collection = f""" Statistics of the collection:
         ========================================
-        Total web pages (urls) processed: {total_documents}\n
-        Max outlinks: {max(outlink_count_list)}, Min outlinks: {min(outlink_count_list)}, Average oulinks: {np.mean(outlink_count_list):.2f}
-        Max inlinks: {max(inlink_count_list)}, Min inlinks: {min(inlink_count_list)}, Average inlinks: {np.mean(inlink_count_list):.2f}
+        Total documents: {totals["saved_docs"]}, fetched documents: {totals["fetched_docs"]}, document acceptance rate: {_rate(totals["saved_docs"], totals["fetched_docs"])}
+        Total lines: {totals["saved_lines"]}, total characters: {totals["characters"]}
+        Tetun lines: {totals["tetun_lines"]}, candidate lines: {totals["candidate_lines"]}, line acceptance rate: {_rate(totals["tetun_lines"], totals["candidate_lines"])}
         ========================================
         """
         self.stats_in_out_links_file_path.save_corpus(
-            stat_inlinks_outlinks.strip())
+            stat_collection.strip())
 
         self.stats_in_out_links_file_path.save_corpus(
             f"\n========= Domain: total documents in the corresponding domain =========")
         sorted_domain_items = sorted(
-            domain_counts.items(), key=lambda x: x[1], reverse=True)
-        for domain, count in sorted_domain_items:
+            stats["domains"].items(), key=lambda x: x[1].get("saved_docs", 0), reverse=True)
+        for domain, domain_stats in sorted_domain_items:
             self.stats_in_out_links_file_path.save_corpus(
-                f"Domain: {domain}, total_docs: {count}")
+                f"Domain: {domain}, total_docs: {domain_stats.get('saved_docs', 0)}, "
+                f"fetched_docs: {domain_stats.get('fetched_docs', 0)}, "
+                f"acceptance_rate: {_rate(domain_stats.get('saved_docs', 0), domain_stats.get('fetched_docs', 0))}, "
+                f"total_lines: {domain_stats.get('saved_lines', 0)}, total_characters: {domain_stats.get('characters', 0)}")
 
         self.stats_in_out_links_file_path.save_corpus(
             f"\n========= Extension: total documents with the corresponding extension =========")
         sorted_extension_items = sorted(
-            extension_counts.items(), key=lambda x: x[1], reverse=True)
+            stats["extensions"].items(), key=lambda x: x[1], reverse=True)
         for extension, count in sorted_extension_items:
             self.stats_in_out_links_file_path.save_corpus(
                 f"Extension: {extension}, total_docs: {count}")
 
+        if self.collect_link_stats:
+            self.generate_link_stats()
+
         logging.info("The statistics have been generated sucessfully.")
+
+    def generate_link_stats(self) -> None:
+        """ Get the inlinks and outlinks of each URL of the final corpus and save their summary. """
+
+        import requests
+        import numpy as np
+        from bs4 import BeautifulSoup
+        from bs4.builder import ParserRejectedMarkup
+        from requests import exceptions
+
+        logging.info("Generating inlinks and outlinks statistics for the collection...")
+        outlink_count_list = []
+        inlink_count_list = []
+        urls = self.get_corpus_urls()
+        for url in urls:
+            domain = extract_domain(url)
+            try:
+                # Outlinks and Inlinks for each URL
+                response = requests.get(url)
+                if response.status_code == 200:
+                    soup = BeautifulSoup(response.content, 'html.parser')
+                    links = soup.find_all('a')
+
+                    outlink_count = 0
+                    inlink_count = 0
+                    for link in links:
+                        href = link.get('href')
+                        if href and (href.startswith('http://') or href.startswith('https://')):
+                            if domain not in href:
+                                outlink_count += 1
+                            else:
+                                inlink_count += 1
+                        elif href and not href.startswith('#'):
+                            inlink_count += 1
+
+                    outlink_count_list.append(outlink_count)
+                    inlink_count_list.append(inlink_count)
+                    self.url_in_out_links.save_corpus(
+                        f"Url: {url}, Outlink: {outlink_count}, Inlink: {inlink_count}")
+                else:
+                    continue
+            except (exceptions.RequestException, exceptions.ConnectionError, exceptions.HTTPError, exceptions.Timeout,
+                    exceptions.TooManyRedirects, exceptions.URLRequired, ParserRejectedMarkup, AssertionError):
+                continue
+
+        if not outlink_count_list:
+            logging.warning("No URL could be retrieved to count the inlinks and outlinks.")
+            return
+
+        # Save the inlinks and outlinks summary
+        stat_inlinks_outlinks = f""" Inlinks and outlinks of the collection:
+        ========================================
+        Total web pages (urls) processed: {len(urls)}\n
+        Max outlinks: {max(outlink_count_list)}, Min outlinks: {min(outlink_count_list)}, Average oulinks: {np.mean(outlink_count_list):.2f}
+        Max inlinks: {max(inlink_count_list)}, Min inlinks: {min(inlink_count_list)}, Average inlinks: {np.mean(inlink_count_list):.2f}
+        ========================================
+        """
+        self.stats_in_out_links_file_path.save_corpus(
+            "\n" + stat_inlinks_outlinks.strip())
+
+
+def _rate(count: int, total: int) -> str:
+    """ Formats a rate as a percentage, or n/a if the total is zero. """
+
+    return f"{count / total:.2%}" if total else "n/a"
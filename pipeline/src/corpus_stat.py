@@ -0,0 +1,129 @@
+import os
+import json
+from pathlib import Path
+from typing import Dict, List
+from common_utils.utils import extract_domain, get_extension
+
+DOMAIN_FIELDS = ("fetched_docs", "source_excluded_docs", "saved_docs", "candidate_lines", "tetun_lines", "saved_lines", "characters")
+
+
+class CorpusStatistic:
+    """
+    This class keeps the collection statistics while the corpus is constructed:
+    (1) Total documents fetched (including the ones excluded by the document source) and saved per domain,
+        and total documents per extension.
+    (2) Total candidate lines, Tetun lines, saved lines and characters per domain.
+
+    The statistics are saved to a JSON sidecar file, merged with the statistics of the previous runs,
+    since the final corpus is appended by each run. They are saved periodically during a run, so the
+    sidecar file follows the final corpus if the run stops.
+    """
+
+    def __init__(self, stats_file_path: Path) -> None:
+        self.stats_file_path = stats_file_path
+        self.domains: Dict[str, Dict[str, int]] = {}
+        self.extensions: Dict[str, int] = {}
+
+    def get_domain_stats(self, url: str) -> Dict[str, int]:
+        """ Returns the statistics of the url's domain. """
+
+        domain = extract_domain(url)
+        if domain not in self.domains:
+            self.domains[domain] = dict.fromkeys(DOMAIN_FIELDS, 0)
+
+        return self.domains[domain]
+
+    def add_fetched_document(self, url: str) -> None:
+        """ Counts a document retrieved from the document source. """
+
+        self.get_domain_stats(url or "")["fetched_docs"] += 1
+
+    def add_excluded_documents(self, url: str, count: int) -> None:
+        """ Counts the documents of a domain excluded by the document source (e.g. Solr filter queries) as fetched. """
+
+        domain_stats = self.get_domain_stats(url)
+        domain_stats["fetched_docs"] += count
+        domain_stats["source_excluded_docs"] += count
+
+    def add_saved_document(self, url: str, candidate_lines: int, tetun_lines: int, saved_lines: List[str]) -> None:
+        """
+        Counts a document saved to the final corpus.
+
+        :param url: the document url.
+        :param candidate_lines: the number of non-empty lines of the cleaned content.
+        :param tetun_lines: the number of non-empty lines identified as Tetun.
+        :param saved_lines: the lines saved to the final corpus (after deduplication).
+        """
+
+        domain_stats = self.get_domain_stats(url)
+        domain_stats["saved_docs"] += 1
+        domain_stats["candidate_lines"] += candidate_lines
+        domain_stats["tetun_lines"] += tetun_lines
+        domain_stats["saved_lines"] += sum(1 for line in saved_lines if line)
+        domain_stats["characters"] += sum(len(line) for line in saved_lines)
+
+        extension = get_extension(url)
+        self.extensions[extension] = self.extensions.get(extension, 0) + 1
+
+    def add_final_corpus(self, corpus: str) -> None:
+        """
+        Counts the documents of a final corpus constructed before the statistics were kept.
+
+        The rejected documents of the former runs are unknown, so each saved document is also
+        counted as fetched, and its candidate and Tetun lines are left out.
+
+        :param corpus: the content of the final corpus, the documents separated by an empty line.
+        """
+
+        for document in corpus.split("\n\n"):
+            lines = document.strip("\n").split("\n")
+            if len(lines) < 2:
+                continue
+            url = lines[1].strip()
+            self.add_fetched_document(url)
+            self.add_saved_document(url, 0, 0, lines[2:])
+
+    def save(self, end_of_run: bool = False) -> None:
+        """
+        Merges the statistics counted since the last save with the sidecar file and saves it.
+
+        :param end_of_run: whether the run is complete, to count it in the sidecar file.
+        """
+
+        stats = load_corpus_stats(self.stats_file_path)
+        for domain, domain_stats in self.domains.items():
+            merged = stats["domains"].setdefault(domain, dict.fromkeys(DOMAIN_FIELDS, 0))
+            for field, value in domain_stats.items():
+                merged[field] = merged.get(field, 0) + value
+        for extension, count in self.extensions.items():
+            stats["extensions"][extension] = stats["extensions"].get(extension, 0) + count
+        if end_of_run:
+            stats["runs"] += 1
+
+        # Write to a temporary file first, so a stopped run does not leave a truncated sidecar file.
+        temp_file_path = f"{self.stats_file_path}.tmp"
+        with open(temp_file_path, "w", encoding="utf-8") as stats_file:
+            json.dump(stats, stats_file, ensure_ascii=False, indent=1)
+        os.replace(temp_file_path, self.stats_file_path)
+        self.domains = {}
+        self.extensions = {}
+
+
+def load_corpus_stats(stats_file_path: Path) -> Dict:
+    """ Loads the statistics sidecar file, or returns empty statistics if it does not exist. """
+
+    if not os.path.exists(stats_file_path):
+        return {"runs": 0, "domains": {}, "extensions": {}}
+    with open(stats_file_path, "r", encoding="utf-8") as stats_file:
+        return json.load(stats_file)
+
+
+def get_total_stats(stats: Dict) -> Dict[str, int]:
+    """ Sums the statistics of all the domains. """
+
+    totals = dict.fromkeys(DOMAIN_FIELDS, 0)
+    for domain_stats in stats["domains"].values():
+        for field in DOMAIN_FIELDS:
+            totals[field] += domain_stats.get(field, 0)
+
+    return totals
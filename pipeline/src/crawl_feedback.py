@@ -0,0 +1,164 @@
+import os
+import re
+import logging
+from pathlib import Path
+from typing import Dict, List, Tuple
+from common_utils.utils import Utils, extract_domain
+from src.corpus_stat import load_corpus_stats
+
+URL_FILTER_BEGIN = "# BEGIN pruned domains (generated by the crawl feedback)"
+URL_FILTER_END = "# END pruned domains"
+
+
+class CrawlFeedback:
+    """
+    This class feeds the Tetun yield of each domain, kept during the corpus construction, back to the crawler:
+    (1) Computes the yield of each domain: saved documents and lines per fetched document.
+    (2) Rewrites the Nutch seed file with a score and a fetch interval for each seed url, as per its domain yield.
+    (3) Prunes the seed urls of the domains that were fetched enough but yield almost no Tetun text.
+    (4) Saves the domains ranked by yield and the pruned domains, excluded by the next seeding cycle.
+    (5) Excludes the pruned domains from the crawl with rules at the top of the Nutch URL filter, since
+        their urls and outlinks already in the crawldb would otherwise still be fetched.
+
+    The seed metadata only applies to the urls already in the crawldb when Nutch injects them with
+    `db.injector.update=true`, as the CLI does.
+    """
+
+    def __init__(
+        self,
+        corpus_stats_file_path: Path,
+        nutch_seed_url_file_path: Path,
+        ranked_domain_file_path: Path,
+        pruned_domain_file_path: Path,
+        url_filter_file_path: Path,
+        min_fetched_docs: int,
+        min_yield: float,
+        unknown_score: float,
+        min_fetch_interval: int,
+        max_fetch_interval: int,
+    ) -> None:
+        self.corpus_stats_file_path = corpus_stats_file_path
+        self.nutch_seed_url_file = Utils(nutch_seed_url_file_path)
+        self.nutch_seed_url_file_path = nutch_seed_url_file_path
+        self.ranked_domain_file_path = ranked_domain_file_path
+        self.pruned_domain_file_path = pruned_domain_file_path
+        self.url_filter_file_path = url_filter_file_path
+        self.min_fetched_docs = min_fetched_docs
+        self.min_yield = min_yield
+        self.unknown_score = unknown_score
+        self.min_fetch_interval = min_fetch_interval
+        self.max_fetch_interval = max_fetch_interval
+        logging.basicConfig(
+            level=logging.DEBUG,
+            format="%(asctime)s %(levelname)s: %(message)s"
+        )
+
+    def get_domain_yields(self) -> Dict[str, Tuple[float, float, int]]:
+        """
+        Computes the yield of the domains fetched at least the minimum number of times.
+
+        :return: a dictionary of domains with their document yield, line yield and fetched documents.
+        """
+
+        stats = load_corpus_stats(self.corpus_stats_file_path)
+        domain_yields = {}
+        for domain, domain_stats in stats["domains"].items():
+            fetched_docs = domain_stats.get("fetched_docs", 0)
+            if fetched_docs < self.min_fetched_docs or fetched_docs == 0:
+                continue
+            domain_yields[domain] = (
+                min(domain_stats.get("saved_docs", 0) / fetched_docs, 1.0),
+                domain_stats.get("saved_lines", 0) / fetched_docs,
+                fetched_docs
+            )
+
+        return domain_yields
+
+    def get_seed_metadata(self, domain_yield: float) -> str:
+        """ Gets the Nutch metadata of a seed url: a score and a fetch interval (in seconds) as per its domain yield. """
+
+        if domain_yield is None:
+            score = self.unknown_score
+            fetch_interval = self.max_fetch_interval
+        else:
+            score = domain_yield
+            fetch_interval = self.max_fetch_interval - domain_yield * (self.max_fetch_interval - self.min_fetch_interval)
+
+        return f"nutch.score={score:.4f}\tnutch.fetchInterval={int(fetch_interval)}"
+
+    def update_seed_urls(self, domain_yields: Dict[str, Tuple[float, float, int]], pruned_domains: List[str]) -> int:
+        """
+        Rewrites the Nutch seed file with the metadata of each seed url and without the pruned domains.
+
+        :return: the number of pruned seed urls.
+        """
+
+        pruned = set(pruned_domains)
+        seed_lines = []
+        total_pruned = 0
+        for line in self.nutch_seed_url_file.load_corpus():
+            seed_url = line.split("\t")[0].strip()
+            if not seed_url:
+                continue
+            domain = extract_domain(seed_url)
+            if domain in pruned:
+                total_pruned += 1
+                continue
+            domain_yield = domain_yields[domain][0] if domain in domain_yields else None
+            seed_lines.append(f"{seed_url}\t{self.get_seed_metadata(domain_yield)}")
+
+        with open(self.nutch_seed_url_file_path, "w", encoding="utf-8") as seed_file:
+            seed_file.write("".join(f"{line}\n" for line in seed_lines))
+
+        return total_pruned
+
+    def update_url_filter(self, pruned_domains: List[str]) -> bool:
+        """
+        Replaces the rules of the pruned domains at the top of the Nutch URL filter, where they are
+        applied before the accept rules. The other rules of the file are kept.
+
+        :return: True if the URL filter was updated.
+        """
+
+        if not os.path.exists(self.url_filter_file_path):
+            # An URL filter with only exclusion rules would reject every url, so it is not created.
+            logging.warning(
+                f"Nutch URL filter not found at: {self.url_filter_file_path}, the pruned domains are only "
+                f"removed from the seeds.")
+            return False
+
+        with open(self.url_filter_file_path, "r", encoding="utf-8") as url_filter_file:
+            lines = url_filter_file.read().splitlines()
+        if URL_FILTER_BEGIN in lines and URL_FILTER_END in lines:
+            lines = lines[:lines.index(URL_FILTER_BEGIN)] + lines[lines.index(URL_FILTER_END) + 1:]
+
+        # The domains keep their subdomain, so the rules match the exact host only.
+        rules = [f"-^https?://{re.escape(domain)}(:[0-9]+)?(/|$)" for domain in sorted(pruned_domains)]
+        if rules:
+            lines = [URL_FILTER_BEGIN, *rules, URL_FILTER_END] + lines
+        with open(self.url_filter_file_path, "w", encoding="utf-8") as url_filter_file:
+            url_filter_file.write("".join(f"{line}\n" for line in lines))
+
+        return True
+
+    def generate_feedback(self) -> None:
+        """ Computes the domain yields and updates the seed file, the ranked domains and the pruned domains. """
+
+        logging.info("Generating the crawl feedback from the collection statistics...")
+        domain_yields = self.get_domain_yields()
+        ranked_domains = sorted(domain_yields.items(), key=lambda x: (x[1][0], x[1][1]), reverse=True)
+        pruned_domains = [domain for domain, (doc_yield, _, _) in ranked_domains if doc_yield < self.min_yield]
+
+        with open(self.ranked_domain_file_path, "w", encoding="utf-8") as ranked_file:
+            for domain, (doc_yield, line_yield, fetched_docs) in ranked_domains:
+                ranked_file.write(
+                    f"{domain}\tdoc_yield={doc_yield:.4f}\tline_yield={line_yield:.2f}\tfetched_docs={fetched_docs}\n")
+        with open(self.pruned_domain_file_path, "w", encoding="utf-8") as pruned_file:
+            pruned_file.write("".join(f"{domain}\n" for domain in pruned_domains))
+
+        total_pruned = self.update_seed_urls(domain_yields, pruned_domains)
+        if self.update_url_filter(pruned_domains):
+            logging.info(f"The pruned domains are excluded by the Nutch URL filter: {self.url_filter_file_path}")
+        logging.info(
+            f"{len(ranked_domains)} domains ranked, {len(pruned_domains)} domains pruned "
+            f"and {total_pruned} seed urls removed from the seed file.")
@@ -0,0 +1,384 @@
+import re
+import gzip
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+SOLR_SPECIAL_CHARS = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/\s])')
+
+
+class DocumentSource:
+    """
+    Base class of the document sources used to construct the corpus.
+
+    A document source streams the crawled documents as dictionaries holding
+    the "title", "url" and "content" fields, as returned by Solr.
+    """
+
+    def get_documents(self) -> Iterator[Dict]:
+        """ Yields each document of the source. """
+        raise NotImplementedError
+
+    def get_excluded_host_counts(self) -> Dict[str, int]:
+        """ Returns the number of documents excluded by the source before they are yielded, per host. """
+        return {}
+
+
+class SolrDocumentSource(DocumentSource):
+    """
+    Streams the documents indexed in Solr, page by page.
+
+    The filter queries (fq) are applied by Solr, so the excluded documents are not transferred.
+    They are still counted per host with a facet query, since they were fetched by Nutch.
+    """
+
+    def __init__(
+        self,
+        solr_api_url: str,
+        solr_start: int,
+        solr_rows: int,
+        filter_queries: List[str] = None,
+        host_field: str = "host"
+    ) -> None:
+        self.solr_api_url = solr_api_url
+        self.solr_start = solr_start
+        self.solr_rows = solr_rows
+        self.filter_queries = filter_queries or []
+        self.host_field = host_field
+
+    def get_total_documents(self, filtered: bool = True) -> int:
+        """ Gets total of documents (matching the filter queries if filtered) from Solr and return it. """
+
+        import requests
+
+        params = {"q": "*:*", "rows": 0}
+        if filtered and self.filter_queries:
+            params["fq"] = self.filter_queries
+        response = requests.get(self.solr_api_url, params=params)
+        response_json = response.json()
+        total_doc = response_json["response"]["numFound"]
+
+        return total_doc
+
+    def get_host_counts(self, filtered: bool) -> Dict[str, int]:
+        """ Gets the number of documents (matching the filter queries if filtered) per host from Solr. """
+
+        import requests
+
+        params = {
+            "q": "*:*",
+            "wt": "json",
+            "rows": 0,
+            "facet": "true",
+            "facet.field": self.host_field,
+            "facet.limit": -1,
+            "facet.mincount": 1
+        }
+        if filtered and self.filter_queries:
+            params["fq"] = self.filter_queries
+        response = requests.get(self.solr_api_url, params=params)
+        host_counts = response.json()["facet_counts"]["facet_fields"][self.host_field]
+
+        # Solr returns the facet as a flat list of hosts and counts.
+        return dict(zip(host_counts[::2], host_counts[1::2]))
+
+    def get_excluded_host_counts(self) -> Dict[str, int]:
+        """ Returns the number of documents excluded by the filter queries, per host. """
+
+        if not self.filter_queries:
+            return {}
+        try:
+            filtered_counts = self.get_host_counts(filtered=True)
+            host_counts = self.get_host_counts(filtered=False)
+        except (KeyError, ValueError) as e:
+            logging.warning(
+                f"The documents excluded by the filter queries could not be counted per '{self.host_field}': {e}")
+            return {}
+        excluded_counts = {}
+        for host, count in host_counts.items():
+            excluded = count - filtered_counts.get(host, 0)
+            if excluded > 0:
+                excluded_counts[host] = excluded
+
+        return excluded_counts
+
+    def get_documents(self) -> Iterator[Dict]:
+        """ Retrieves the documents from Solr, requesting only the fields used by the pipeline. """
+
+        import requests
+
+        logging.info("Getting and loading json data from Solr...")
+        params = {
+            "q": "*:*",
+            "wt": "json",
+            "fl": "title,url,content",
+            "start": self.solr_start,
+            "rows": self.solr_rows
+        }
+        if self.filter_queries:
+            params["fq"] = self.filter_queries
+
+        start = self.solr_start
+        total_documents = self.get_total_documents()
+        if self.filter_queries:
+            all_documents = self.get_total_documents(filtered=False)
+            logging.info(
+                f"Solr filter queries excluded {all_documents - total_documents} of {all_documents} documents, "
+                f"{total_documents} documents will be fetched.")
+        while start < total_documents:
+            params["start"] = start
+            response = requests.get(self.solr_api_url, params=params)
+            docs = response.json()["response"]["docs"]
+            if not docs:
+                break
+
+            yield from docs
+
+            # Retrieve the next page of documents from Solr.
+            start += len(docs)
+
+
+class JsonlDocumentSource(DocumentSource):
+    """ Streams the documents from a JSON Lines dump, one JSON object per line. """
+
+    def __init__(self, dump_file_path: Path) -> None:
+        self.dump_file_path = dump_file_path
+
+    def get_documents(self) -> Iterator[Dict]:
+        """ Reads the dump line by line and yields each valid JSON document. """
+
+        logging.info(f"Reading JSON Lines documents from {self.dump_file_path}...")
+        with _open_text(self.dump_file_path) as dump_file:
+            for line_number, line in enumerate(dump_file, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    doc = json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning(
+                        f"Invalid JSON on line {line_number} -> {self.dump_file_path}")
+                    continue
+                if not isinstance(doc, dict):
+                    logging.warning(
+                        f"The JSON on line {line_number} is not an object -> {self.dump_file_path}")
+                    continue
+                yield doc
+
+
+class NutchDumpDocumentSource(DocumentSource):
+    """
+    Streams the documents from the output of `nutch readseg -dump`.
+
+    Each record starts with a "Recno::" line followed by the "URL::" line and
+    the CrawlDatum, Content, ParseData and ParseText sections. The title is taken
+    from the ParseData section and the content from the ParseText section.
+    """
+
+    SECTIONS = ("CrawlDatum::", "Content::", "ParseData::", "ParseText::")
+
+    def __init__(self, dump_file_path: Path) -> None:
+        self.dump_file_path = dump_file_path
+
+    def get_documents(self) -> Iterator[Dict]:
+        """ Parses the dump record by record and yields the documents having a parsed text. """
+
+        logging.info(f"Reading Nutch segment dump from {self.dump_file_path}...")
+        record = None
+        section = None
+        with _open_text(self.dump_file_path) as dump_file:
+            for line in dump_file:
+                line = line.rstrip("\r\n")
+                if line.startswith("Recno::"):
+                    document = self._to_document(record)
+                    if document is not None:
+                        yield document
+                    record = {"url": None, "title": None, "content": []}
+                    section = None
+                elif record is None:
+                    continue
+                elif line.startswith("URL::") and section is None:
+                    record["url"] = line[len("URL::"):].strip()
+                elif line in self.SECTIONS:
+                    section = line
+                elif section == "ParseData::" and line.startswith("Title:") and record["title"] is None:
+                    record["title"] = line[len("Title:"):].strip()
+                elif section == "ParseText::":
+                    record["content"].append(line)
+
+        document = self._to_document(record)
+        if document is not None:
+            yield document
+
+    @staticmethod
+    def _to_document(record: Optional[Dict]) -> Optional[Dict]:
+        """ Converts a parsed record into a document, the content is None if no text was parsed. """
+
+        if record is None or record["url"] is None:
+            return None
+        content = "\n".join(record["content"]).strip("\n")
+
+        return {
+            "title": record["title"],
+            "url": record["url"],
+            "content": content if content else None
+        }
+
+
+class WarcDocumentSource(DocumentSource):
+    """
+    Streams the documents from a WARC file (optionally gzip compressed).
+
+    Only the "response", "resource" and "conversion" records are used. HTML payloads
+    are parsed to get the title and the visible text of the page.
+    """
+
+    RECORD_TYPES = ("response", "resource", "conversion")
+
+    def __init__(self, dump_file_path: Path) -> None:
+        self.dump_file_path = dump_file_path
+
+    def get_documents(self) -> Iterator[Dict]:
+        """ Reads the WARC file record by record and yields each document. """
+
+        logging.info(f"Reading WARC records from {self.dump_file_path}...")
+        opener = gzip.open if str(self.dump_file_path).endswith(".gz") else open
+        with opener(self.dump_file_path, "rb") as warc_file:
+            while True:
+                headers = self._read_headers(warc_file)
+                if headers is None:
+                    break
+                length = int(headers.get("content-length", 0))
+                block = warc_file.read(length)
+                if headers.get("warc-type") not in self.RECORD_TYPES:
+                    continue
+
+                url = headers.get("warc-target-uri", "").strip("<>")
+                if headers.get("warc-type") == "response":
+                    content_type, payload = self._split_http_response(block)
+                else:
+                    content_type, payload = headers.get("content-type", ""), block
+                yield self._to_document(url, content_type, payload)
+
+    @staticmethod
+    def _read_headers(warc_file) -> Optional[Dict[str, str]]:
+        """ Reads the headers of the next WARC record, skipping the blank lines between records. """
+
+        line = warc_file.readline()
+        while line in (b"\r\n", b"\n"):
+            line = warc_file.readline()
+        if not line:
+            return None
+
+        headers = {}
+        for line in iter(warc_file.readline, b""):
+            if line in (b"\r\n", b"\n"):
+                break
+            name, _, value = line.decode("utf-8", "replace").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        return headers
+
+    @staticmethod
+    def _split_http_response(block: bytes):
+        """ Splits the HTTP response block into its content type and payload. """
+
+        head, _, payload = block.partition(b"\r\n\r\n")
+        content_type = ""
+        for line in head.decode("iso-8859-1").split("\r\n")[1:]:
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-type":
+                content_type = value.strip()
+
+        return content_type, payload
+
+    @staticmethod
+    def _to_document(url: str, content_type: str, payload: bytes) -> Dict:
+        """ Converts the payload into a document, extracting the title and text from HTML pages. """
+
+        if "html" not in content_type.lower():
+            text = payload.decode("utf-8", "replace")
+            return {"title": None, "url": url, "content": text if text.strip() else None}
+
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(payload, "html.parser")
+        title = soup.title.get_text().strip() if soup.title else None
+        for element in soup(["script", "style", "noscript"]):
+            element.decompose()
+        text = soup.get_text("\n").strip()
+
+        return {"title": title, "url": url, "content": text if text else None}
+
+
+def _open_text(file_path: Path):
+    """ Opens a text dump for reading, transparently decompressing gzip files. """
+
+    if str(file_path).endswith(".gz"):
+        return gzip.open(file_path, "rt", encoding="utf-8", errors="replace")
+    return open(file_path, "r", encoding="utf-8", errors="replace")
+
+
+def escape_solr_query(text: str) -> str:
+    """ Escapes the special characters of the Solr standard query parser. """
+
+    return SOLR_SPECIAL_CHARS.sub(r"\\\1", text)
+
+
+def build_solr_filter_queries(
+    url_field: str,
+    content_field: str,
+    url_exclude_substrings: List[str],
+    tetun_lang: str
+) -> List[str]:
+    """
+    Builds the Solr filter queries excluding the documents that are dropped by the corpus construction.
+
+    :param url_field: the Solr field holding the url as a string (the "id" field in the Nutch schema).
+    :param content_field: the Solr field holding the page content.
+    :param url_exclude_substrings: the urls containing any of these substrings are excluded.
+    :param tetun_lang: only the Wikipedia urls containing the Tetun language code are kept.
+    :return: a list of filter queries, each of them cached separately by Solr.
+    """
+
+    filter_queries = [f"-{url_field}:*{escape_solr_query(substring)}*" for substring in url_exclude_substrings]
+    filter_queries.append(
+        f"-(+{url_field}:*wikipedia* -{url_field}:*{escape_solr_query(tetun_lang)}*)")
+    filter_queries.append(f"{content_field}:[* TO *]")
+
+    return filter_queries
+
+
+DOCUMENT_SOURCES = {
+    "jsonl": JsonlDocumentSource,
+    "nutch_dump": NutchDumpDocumentSource,
+    "warc": WarcDocumentSource,
+}
+
+
+def get_document_source(
+    source_type: str,
+    solr_api_url: str,
+    solr_start: int,
+    solr_rows: int,
+    dump_file_path: Path = None,
+    solr_filter_queries: List[str] = None,
+    solr_host_field: str = "host"
+) -> DocumentSource:
+    """
+    Creates the document source selected in the configuration.
+
+    :param source_type: one of "solr", "jsonl", "nutch_dump" or "warc".
+    :param dump_file_path: the dump file read by the local file sources.
+    :param solr_filter_queries: the filter queries applied by Solr.
+    :param solr_host_field: the Solr field holding the host, to count the excluded documents per host.
+    :return: the document source.
+    """
+
+    if source_type == "solr":
+        return SolrDocumentSource(solr_api_url, solr_start, solr_rows, solr_filter_queries, solr_host_field)
+    if source_type in DOCUMENT_SOURCES:
+        return DOCUMENT_SOURCES[source_type](dump_file_path)
+    raise ValueError(
+        f"Unknown document source '{source_type}', expected one of: solr, {', '.join(DOCUMENT_SOURCES)}.")
@@ -1,146 +1,234 @@
-import requests
-import json
+import os
 import logging
 from pathlib import Path
+from typing import Dict, List, Set, Tuple
 from common_utils.tetun_lid import TetunLid
-from common_utils.utils import Utils, remove_html_tags
+from common_utils.lid_cascade import LidPreClassifier
+from common_utils.lid_batcher import LidBatcher
+from common_utils.text_cleaner import TextCleaner
+from common_utils.utils import Utils
+from src.document_source import DocumentSource
+from src.corpus_stat import CorpusStatistic
+
+# Number of fetched documents between two saves of the collection statistics
+STATS_SAVE_INTERVAL = 1000
 
 
 class GetCorpus:
     """
     This class:
-    (1) Retrieves and load each document from Solr.
+    (1) Retrieves and load each document from the document source (Solr or a local dump).
     (2) Applies the LID model for each document title and collects only those that satisfy the predefined threshold.
-    (3) Saves each title with the respective URL to the final corpus file and applies the LID model to its content.
-    (3) Saves each line on the content that satisfies the predefined threshold to the final corpus file.
+    (3) Saves each title with the respective URL to the final corpus file, cleans its content and applies the LID model to it.
+    (4) Saves each line on the content that satisfies the predefined threshold to the final corpus file.
+
+    The collection statistics (per domain and per extension) are kept while the documents are
+    saved, and merged into the statistics file periodically and at the end, even if the run fails.
+    The statistics file is first created from the documents already in the final corpus.
+
+    The titles and the content lines are buffered separately and the LID model is applied to each
+    in batches of the predefined size: the titles by number of documents, then the lines of the
+    documents with a valid title. The output keeps the order of the documents.
     """
 
     def __init__(
         self,
-        solr_api_url: str,
-        solr_start: int,
-        solr_rows: int,
+        document_source: DocumentSource,
         max_consecutive_newlines: int,
         tetun_lang: str,
         lang_proba_threshold: float,
         lid_model_file_path: Path,
-        final_corpus_file_path: Path
+        final_corpus_file_path: Path,
+        lid_pre_classifier: LidPreClassifier = None,
+        lid_batch_size: int = 1,
+        corpus_stats_file_path: Path = None,
+        url_exclude_substrings: List[str] = ("/feed", "/tag", "facebook")
     ) -> None:
-        self.solr_api_url = solr_api_url
-        self.solr_start = solr_start,
-        self.solr_rows = solr_rows,
-        self.max_consecutive_newlines = max_consecutive_newlines,
+        self.document_source = document_source
+        self.text_cleaner = TextCleaner(max_consecutive_newlines)
         self.tetun_lang = tetun_lang
         self.tetun_lid = TetunLid(
-            tetun_lang, lang_proba_threshold, lid_model_file_path)
+            tetun_lang, lang_proba_threshold, lid_model_file_path, lid_pre_classifier)
+        self.lid_batcher = LidBatcher(self.tetun_lid, lid_batch_size)
+        self.lid_batch_size = lid_batch_size
         self.final_corpus = Utils(final_corpus_file_path)
+        self.corpus_stat = CorpusStatistic(corpus_stats_file_path) if corpus_stats_file_path else None
+        self.url_exclude_substrings = url_exclude_substrings
+        self.fetched_docs = 0
+        self.client_filtered_docs = 0
+        self.next_stats_save = STATS_SAVE_INTERVAL
         logging.basicConfig(
             level=logging.DEBUG,
             format="%(asctime)s %(levelname)s: %(message)s"
         )
 
-    def get_total_documents(self) -> int:
-        """ Gets total of documents from Solr and return it. """
-
-        params = {"q": "*:*", "rows": self.solr_rows}
-        response = requests.get(self.solr_api_url, params=params)
-        response_json = response.json()
-        total_doc = response_json["response"]["numFound"]
-
-        return total_doc
-
     def generate_corpus(self) -> None:
         """
-        (1) Retrieve and load each document from the Solr. 
+        (1) Retrieve and load each document from the document source.
         (2) Apply the Tetun LID model to the document title and collect only those with a probability >= threshold.
         (3) Save title, url and its content that has a proba >= threshold to the final corpus file.
         (4) Add a newline to the end of each document.
         """
 
-        logging.info("Getting and loading json data from Solr...")
-        params = {
-            "q": "*:*",
-            "wt": "json",
-            "start": self.solr_start,
-            "rows": self.solr_rows
-        }
-
-        list_of_titles = []
-        start = self.solr_start[0]
-        while start < self.get_total_documents():
-            params["start"] = start
-            response = requests.get(self.solr_api_url, params=params)
-            data = json.loads(response.text)
-            docs = data["response"]["docs"]
-
-            for doc in docs:
-                logging.info("Generating titles...")
-                if not doc.get("title") is None:
-                    get_title = doc.get("title")
-
-                logging.info("Validating titles...")
-                valid_title = self.tetun_lid.get_tetun_text(
-                    [get_title])  # Apply the Tetun LID model
-
-                if valid_title and not valid_title in list_of_titles:  # Avoid title duplication
-                    list_of_titles.append([get_title])
-
-                    logging.info("Generating page content...")
-                    get_url = doc.get("url")
-                    get_content = doc.get("content")
-
-                    # Exclude the Urls contain '/feed' and '/tag'.
-                    if not '/feed' in get_url and not '/tag' in get_url:
-                        # Ensure that only Tetun wikipedia data is processed.
-                        if "wikipedia" in get_url and not self.tetun_lang in get_url:
-                            logging.warning(
-                                f"Not Tetun Wikipedia -> {get_url}.")
-                            continue
-                        # Excluding facebook since its content was not extracted by Nutch.
-                        if "facebook" in get_url:
-                            logging.warning(f"Facebook page -> {get_url}.")
-                            continue
-
-                        if get_content is None:  # Make sure that the content is not empty.
-                            logging.warning(f"Empty content -> {get_title}.")
-                            continue
-
-                        self.final_corpus.save_corpus(get_title.strip())
-                        self.final_corpus.save_corpus(get_url.strip())
-
-                        consecutive_newlines = 0
-                        seen_sentences = set()
-                        text_lines = get_content.split("\n")
-                        tetun_text = self.tetun_lid.get_tetun_text(
-                            text_lines)  # Apply the Tetun LID model
-                        for index, doc in enumerate(tetun_text):
-                            # Remove HTML tags if exist on the given text
-                            text_line = remove_html_tags(doc.strip())
-                            if text_line not in seen_sentences:
-                                if len(text_line) == 0:
-                                    consecutive_newlines += 1
-                                else:
-                                    consecutive_newlines = 0
-                                if len(text_line) == 0 and consecutive_newlines == self.max_consecutive_newlines:
-                                    continue
-                                else:
-                                    self.final_corpus.save_corpus(text_line)
-                                    # Add a new line at the end of each non-empty document
-                                    if index == len(tetun_text) - 1:
-                                        self.final_corpus.save_corpus(
-                                            is_not_eol=False)
-                                    if len(text_line) > 0:
-                                        seen_sentences.add(text_line)
-                        logging.info(
-                            f"The content was sucessfully generated for the title -> {get_title}")
-                    else:
-                        logging.warning(
-                            f"The URL contains 'feed' or 'tag' -> {get_url}")
-                else:
-                    logging.warning(
-                        f"The title is not in Tetun -> {get_title}")
-
-            # Retrieve the next doc from Solr by incrementing 1 to the start value.
-            start += 1
-
+        if self.corpus_stat is not None and not os.path.exists(self.corpus_stat.stats_file_path):
+            logging.info("Creating the collection statistics from the final corpus...")
+            self.corpus_stat.add_final_corpus(self.final_corpus.load_final_corpus() or "")
+            self.corpus_stat.save()
+
+        is_complete = False
+        try:
+            self.process_source()
+            is_complete = True
+        finally:
+            if self.corpus_stat is not None:
+                self.corpus_stat.save(end_of_run=is_complete)
+        self.tetun_lid.log_stats()
+        logging.info(
+            f"{self.fetched_docs} documents fetched, {self.client_filtered_docs} of them excluded by the "
+            f"client-side URL and content checks.")
         logging.info("The final corpus has been generated sucessfully.")
+
+    def process_source(self) -> None:
+        """ Retrieves the documents from the document source and processes them in batches. """
+
+        if self.corpus_stat is not None:
+            # The documents excluded by the source were fetched by Nutch too, they lower the yield of their domain.
+            for host, count in self.document_source.get_excluded_host_counts().items():
+                self.corpus_stat.add_excluded_documents(f"http://{host}/", count)
+
+        seen_titles = set()
+        title_docs = []
+        content_docs = []
+        content_lines = 0
+        for doc in self.document_source.get_documents():
+            self.fetched_docs += 1
+            if self.corpus_stat is not None:
+                self.corpus_stat.add_fetched_document(doc.get("url"))
+            # The local dumps (e.g. JSON Lines or WARC) may contain documents without url.
+            if not doc.get("url"):
+                logging.warning(f"Empty url -> {doc.get('title')}.")
+                self.client_filtered_docs += 1
+                continue
+            logging.info("Generating titles...")
+            if doc.get("title") is None:
+                logging.warning(f"Empty title -> {doc.get('url')}.")
+                continue
+
+            title_docs.append(doc)
+            if len(title_docs) < self.lid_batch_size:
+                continue
+            for valid_doc in self.validate_documents(title_docs, seen_titles):
+                content_docs.append(valid_doc)
+                content_lines += len(valid_doc[1])
+            title_docs = []
+            if content_lines >= self.lid_batch_size:
+                self.process_documents(content_docs)
+                content_docs = []
+                content_lines = 0
+                # The pending documents are counted as fetched only, the final save completes them.
+                if self.corpus_stat is not None and self.fetched_docs >= self.next_stats_save:
+                    self.corpus_stat.save()
+                    self.next_stats_save = self.fetched_docs + STATS_SAVE_INTERVAL
+
+        content_docs.extend(self.validate_documents(title_docs, seen_titles))
+        self.process_documents(content_docs)
+
+    def validate_documents(self, docs: List[Dict], seen_titles: Set[str]) -> List[Tuple[Dict, List[str]]]:
+        """
+        Applies the Tetun LID model to the titles of the buffered documents and cleans the content
+        of the valid documents, in their original order.
+
+        :param docs: a list of documents.
+        :param seen_titles: the titles already processed, to avoid title duplication.
+        :return: a list of the valid documents with their cleaned content lines.
+        """
+
+        if not docs:
+            return []
+
+        logging.info("Validating titles...")
+        valid_titles = self.lid_batcher.get_tetun_groups(
+            [[doc["title"]] for doc in docs])  # Apply the Tetun LID model
+
+        valid_docs = []
+        for doc, valid_title in zip(docs, valid_titles):
+            get_title = doc["title"]
+            if not valid_title or get_title in seen_titles:  # Avoid title duplication
+                logging.warning(
+                    f"The title is not in Tetun -> {get_title}")
+                continue
+            seen_titles.add(get_title)
+
+            logging.info("Generating page content...")
+            get_url = doc.get("url")
+            get_content = doc.get("content")
+
+            # Exclude the Urls containing the excluded substrings (e.g. '/feed', '/tag' and 'facebook',
+            # since the Facebook content was not extracted by Nutch). With Solr, these documents are
+            # already excluded by the filter queries, the checks are kept as a safety net.
+            excluded_substring = next(
+                (substring for substring in self.url_exclude_substrings if substring in get_url), None)
+            if excluded_substring is not None:
+                logging.warning(
+                    f"The URL contains '{excluded_substring}' -> {get_url}")
+                self.client_filtered_docs += 1
+                continue
+            # Ensure that only Tetun wikipedia data is processed.
+            if "wikipedia" in get_url and not self.tetun_lang in get_url:
+                logging.warning(
+                    f"Not Tetun Wikipedia -> {get_url}.")
+                self.client_filtered_docs += 1
+                continue
+
+            if get_content is None:  # Make sure that the content is not empty.
+                logging.warning(f"Empty content -> {get_title}.")
+                self.client_filtered_docs += 1
+                continue
+
+            valid_docs.append((doc, self.text_cleaner.clean_document(get_content)))
+
+        return valid_docs
+
+    def process_documents(self, valid_docs: List[Tuple[Dict, List[str]]]) -> None:
+        """
+        Applies the Tetun LID model to the content lines of the valid documents and saves them
+        to the final corpus file in their original order.
+
+        :param valid_docs: a list of the valid documents with their cleaned content lines.
+        """
+
+        if not valid_docs:
+            return
+
+        tetun_texts = self.lid_batcher.get_tetun_groups(
+            [lines for _, lines in valid_docs])  # Apply the Tetun LID model
+        for (doc, lines), tetun_text in zip(valid_docs, tetun_texts):
+            saved_lines = self.save_document(doc["title"], doc["url"], tetun_text)
+            if self.corpus_stat is not None:
+                self.corpus_stat.add_saved_document(
+                    doc["url"], sum(1 for line in lines if line), sum(1 for line in tetun_text if line), saved_lines)
+
+    def save_document(self, title: str, url: str, tetun_text: List[str]) -> List[str]:
+        """
+        Saves the title, url and the Tetun lines of a document to the final corpus file.
+
+        :param title: the document title.
+        :param url: the document url.
+        :param tetun_text: the cleaned lines of the document content that are in Tetun.
+        :return: the content lines saved, without the duplicated lines.
+        """
+
+        # The lines are already cleaned and the runs of empty lines collapsed by the text cleaner.
+        document_lines = [title.strip(), url.strip()]
+        seen_sentences = set()
+        for text_line in tetun_text:
+            if text_line not in seen_sentences:
+                document_lines.append(text_line)
+                if len(text_line) > 0:
+                    seen_sentences.add(text_line)
+        # Save the document at once and add a new line at the end of it
+        self.final_corpus.save_corpus("\n".join(document_lines) + "\n")
+        logging.info(
+            f"The content was sucessfully generated for the title -> {title}")
+
+        return document_lines[2:]
@@ -1,14 +1,14 @@
 import re
 from pathlib import Path
 from typing import List
-from googlesearch import search
 from common_utils.utils import Utils, extract_domain
+from src.search_backend import ConcurrentSearch
 
 
 class GetSeedUrl:
     """
-    The GetURL class checks each url if:
-    (1) The domain is not on the excluded domain list.
+    The GetURL class runs the seed word queries concurrently, merges their results and checks each url if:
+    (1) The domain is not on the excluded domain list, nor on the pruned (low Tetun yield) domain list.
     (2) It is a new seed url.
     (3) It is a new domain.
 
@@ -21,19 +21,23 @@ class GetSeedUrl:
         self,
         extension_to_exclude: List[str],
         domains_to_exclude: List[str],
-        generate_seed_words: callable,
+        seed_queries: List[str],
+        search: ConcurrentSearch,
         google_search_num_result: int,
         max_seed_url_length: int,
         nutch_seed_url_file_path: Path,
         domain_file_path: Path,
+        pruned_domains: List[str] = None,
     ) -> None:
         self.extension_to_exclude = extension_to_exclude
         self.domains_to_exclude = domains_to_exclude
-        self.generate_seed_words = generate_seed_words
+        self.seed_queries = seed_queries
+        self.search = search
         self.google_search_num_result = google_search_num_result
         self.max_seed_url_length = max_seed_url_length
         self.nutch_seed_url_file = Utils(nutch_seed_url_file_path)
         self.domain_file = Utils(domain_file_path)
+        self.pruned_domains = set(pruned_domains or [])
 
     def is_allowed_seed_url(self, seed_url: str) -> bool:
         """
@@ -46,34 +50,15 @@ class GetSeedUrl:
 
         is_allowed = not any(
             re.search(ext, seed_url.lower()) for ext in self.extension_to_exclude
-        ) and not any(domain in seed_url for domain in self.domains_to_exclude)
+        ) and not any(domain in seed_url for domain in self.domains_to_exclude
+                      ) and extract_domain(seed_url) not in self.pruned_domains
 
         return is_allowed
 
-    def is_new_seed_url(self, seed_url: str) -> bool:
-        """
-        Checks if the given url is new.
-
-        :param seed_url: a seed url.
-        :return: True if the url is new, False otherwise.
-        """
-
-        new_seed_url = seed_url not in self.nutch_seed_url_file.load_corpus()
-
-        return new_seed_url
-
-    def is_new_domain(self, seed_url: str) -> bool:
-        """
-        Checks if the input URL's domain contains any of the domains in the domain list.
-
-        :param url: The URL to be checked.
-        :return: True if the URL's domain contains any of the domains, False otherwise.
-        """
-
-        domain = extract_domain(seed_url)
-        new_domain = domain not in self.domain_file.load_corpus()
+    def load_seed_urls(self) -> set:
+        """ Loads the seed urls of the seed file, without the Nutch metadata added by the crawl feedback. """
 
-        return new_domain
+        return {line.split("\t")[0] for line in self.nutch_seed_url_file.load_corpus()}
 
     def get_seed_urls(self) -> List[str]:
         """
@@ -82,8 +67,9 @@ class GetSeedUrl:
         """
 
         seeds_urls = set()
-        for url in search(self.generate_seed_words, num_results=self.google_search_num_result):
-            if self.is_allowed_seed_url(url) and self.is_new_seed_url(url):
+        existing_seed_urls = self.load_seed_urls()
+        for url in self.search.search_all(self.seed_queries, self.google_search_num_result):
+            if self.is_allowed_seed_url(url) and url not in existing_seed_urls:
                 seeds_urls.add(url)
                 if len(url) < self.max_seed_url_length:
                     self.nutch_seed_url_file.save_corpus(url)
@@ -99,16 +85,17 @@ class GetSeedUrl:
         """
 
         domains = set()
+        existing_domains = set(self.domain_file.load_corpus())
         for seed_url in seed_urls:
             domain = extract_domain(seed_url)
-            if self.is_new_domain(seed_url):
+            if domain not in existing_domains and domain not in domains:
                 domains.add(domain)
                 self.domain_file.save_corpus(domain)
 
         return list(domains)
 
     def generate_seed_urls(self) -> None:
-        """ Gets seed urls returned by the Google search and their respective domains. """
+        """ Gets seed urls returned by the search backend and their respective domains. """
 
         seed_urls = self.get_seed_urls()
         domains = self.get_domains(seed_urls)
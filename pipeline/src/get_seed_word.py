@@ -14,7 +14,7 @@ class GetSeedWords:
     (2) Tokenizes the text sample into tokens (words).
     (3) Applies the LID model to get tokens with the probability >= threshold.
     (4) Counts the word frequency and calculates its probability of distribution.
-    (5) Samples three unique words from (4) and saves them to the seed file.
+    (5) Samples three unique words from (4) and saves them to the seed file, as many times as the number of queries.
     """
 
     def __init__(
@@ -79,13 +79,12 @@ class GetSeedWords:
 
         return probs_dist
 
-    def generate_seed_words(self) -> str:
+    def sample_seed_words(self, proba_dist: Dict) -> str:
         """
-        Samples three unique words and save them into the seed file 
+        Samples three unique words as per their probability of distribution
         and return a string of sampled words.
         """
 
-        proba_dist = self.calculate_proba_distribution()
         sequence_words = list(proba_dist.keys())
         weights = list(proba_dist.values())
         samples = set()
@@ -95,8 +94,20 @@ class GetSeedWords:
             sequence_words.remove(sample)
             weights.remove(proba_dist[sample])
 
-        seeds = " ".join(list(samples))
-        self.seed_words_file.save_corpus(seeds)
-        print(f"Seed words: {seeds}")
+        return " ".join(list(samples))
 
-        return seeds
+    def generate_seed_word_queries(self, num_queries: int) -> List[str]:
+        """
+        Samples the seed words of several queries from a single probability distribution,
+        save them into the seed file and return a list of queries.
+        """
+
+        proba_dist = self.calculate_proba_distribution()
+        queries = []
+        for _ in range(num_queries):
+            seeds = self.sample_seed_words(proba_dist)
+            self.seed_words_file.save_corpus(seeds)
+            print(f"Seed words: {seeds}")
+            queries.append(seeds)
+
+        return queries
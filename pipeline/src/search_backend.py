@@ -0,0 +1,164 @@
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SearchBackend:
+    """ Base class of the search engines queried with the seed words to get the seed URLs. """
+
+    def search(self, query: str, num_results: int) -> List[str]:
+        """ Returns the URLs found for the query. """
+        raise NotImplementedError
+
+
+class GoogleSearchBackend(SearchBackend):
+    """ Queries Google with the googlesearch package. """
+
+    def search(self, query: str, num_results: int) -> List[str]:
+        from googlesearch import search
+
+        return list(search(query, num_results=num_results))
+
+
+class HttpSearchBackend(SearchBackend):
+    """
+    Queries an HTTP search API, e.g. a SearXNG instance or a local stand-in server.
+
+    The API is called with the "q", "format" and "num" parameters and must return either
+    a JSON list of URLs or an object with a "results" list of objects having an "url" field.
+    """
+
+    def __init__(self, api_url: str) -> None:
+        self.api_url = api_url
+
+    def search(self, query: str, num_results: int) -> List[str]:
+        import requests
+
+        params = {"q": query, "format": "json", "num": num_results}
+        response = requests.get(self.api_url, params=params, timeout=30)
+        response.raise_for_status()
+        results = response.json()
+        if isinstance(results, dict):
+            results = [result.get("url") for result in results.get("results", [])]
+
+        return [url for url in results if url][:num_results]
+
+
+class FileSearchBackend(SearchBackend):
+    """
+    Reads the search results from a local JSON file, for the offline tests of the seeder.
+
+    The file maps each query to its list of URLs, the URLs of the "*" key are returned for unknown queries.
+    """
+
+    def __init__(self, results_file_path: Path) -> None:
+        with open(results_file_path, "r", encoding="utf-8") as results_file:
+            self.results: Dict[str, List[str]] = json.load(results_file)
+
+    def search(self, query: str, num_results: int) -> List[str]:
+        return self.results.get(query, self.results.get("*", []))[:num_results]
+
+
+class RateLimiter:
+    """ Ensures a minimum interval between two requests, shared by all the threads. """
+
+    def __init__(self, min_interval: float) -> None:
+        self.min_interval = min_interval
+        self.next_request_time = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self) -> None:
+        """ Blocks until the next request is allowed. """
+
+        with self.lock:
+            now = time.monotonic()
+            request_time = max(now, self.next_request_time)
+            self.next_request_time = request_time + self.min_interval
+        if request_time > now:
+            time.sleep(request_time - now)
+
+
+class ConcurrentSearch:
+    """
+    This class:
+    (1) Runs the seed word queries concurrently against the search backend.
+    (2) Applies a global rate limit and retries the failed queries with an exponential backoff.
+    (3) Merges the URLs of all the queries, removing the duplicates and keeping the order of the queries.
+    """
+
+    def __init__(
+        self,
+        search_backend: SearchBackend,
+        max_workers: int,
+        min_interval: float,
+        max_retries: int,
+        backoff_factor: float,
+    ) -> None:
+        self.search_backend = search_backend
+        self.max_workers = max(max_workers, 1)
+        self.rate_limiter = RateLimiter(min_interval)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+
+    def search_query(self, query: str, num_results: int) -> List[str]:
+        """ Searches a query, retrying it on failure, and returns its URLs (empty if all the attempts failed). """
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait()
+            try:
+                return self.search_backend.search(query, num_results)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logging.warning(f"Search failed for the query '{query}': {e}")
+                    break
+                delay = self.backoff_factor * 2 ** attempt
+                logging.warning(f"Search failed for the query '{query}', retrying in {delay:.1f}s: {e}")
+                time.sleep(delay)
+
+        return []
+
+    def search_all(self, queries: List[str], num_results: int) -> List[str]:
+        """
+        Searches all the queries and returns the unique URLs.
+
+        :param queries: a list of seed word queries.
+        :param num_results: the number of results requested per query.
+        :return: a list of unique URLs.
+        """
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(lambda query: self.search_query(query, num_results), queries))
+
+        urls = list(dict.fromkeys(url for query_urls in results for url in query_urls))
+        logging.info(
+            f"{len(queries)} queries returned {sum(len(r) for r in results)} URLs, {len(urls)} unique.")
+
+        return urls
+
+
+SEARCH_BACKENDS = {
+    "google": GoogleSearchBackend,
+    "http": HttpSearchBackend,
+    "file": FileSearchBackend,
+}
+
+
+def get_search_backend(backend_type: str, location: str = None) -> SearchBackend:
+    """
+    Creates the search backend selected in the configuration.
+
+    :param backend_type: one of "google", "http" or "file".
+    :param location: the API URL of the "http" backend or the results file of the "file" backend.
+    :return: the search backend.
+    """
+
+    if backend_type == "google":
+        return GoogleSearchBackend()
+    if backend_type in SEARCH_BACKENDS:
+        return SEARCH_BACKENDS[backend_type](location)
+    raise ValueError(
+        f"Unknown search backend '{backend_type}', expected one of: {', '.join(SEARCH_BACKENDS)}.")
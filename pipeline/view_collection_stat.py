@@ -1,5 +1,4 @@
-import hydra
-from hydra.core.config_store import ConfigStore
+import os
 from common_utils.config import PipelineConfig
 from common_utils.utils import get_file_path
 from src.collection_stat import CollectionStatistic
@@ -15,16 +14,22 @@ class ViewCollectionStatistic:
         self.collection_stat = CollectionStatistic(
             get_file_path(cfg.paths.data, cfg.files.final_corpus),
             get_file_path(cfg.paths.data, cfg.files.url_in_out_links),
-            get_file_path(cfg.paths.data, cfg.files.stats_in_out_links)
+            get_file_path(cfg.paths.data, cfg.files.stats_in_out_links),
+            os.path.join(cfg.paths.data, cfg.files.corpus_stats),
+            cfg.params.collect_link_stats
         )
 
     def run(self) -> None:
         self.collection_stat.generate_stats()
 
 
-cs = ConfigStore.instance()
-cs.store(name="pipeline_config", node=PipelineConfig)
 if __name__ == "__main__":
+    import hydra
+    from hydra.core.config_store import ConfigStore
+
+    cs = ConfigStore.instance()
+    cs.store(name="pipeline_config", node=PipelineConfig)
+
     @hydra.main(config_path="conf", config_name="config")
     def main(cfg: PipelineConfig):
         generate_stat = ViewCollectionStatistic(cfg)